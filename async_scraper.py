@@ -0,0 +1,355 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import requests
+
+from concurrency import AdaptiveConcurrency
+from scraper import HEADERS, MAX_EMPTY_PAGES, TRANSIENT_ERRORS, PageProgress, Scraper, create_session
+
+try:
+    import aiohttp
+except ImportError:  # Optional: fall back to the pooled requests session on worker threads
+    aiohttp = None
+
+# Requests in flight at once; each costs a coroutine, not an OS thread
+DEFAULT_MAX_IN_FLIGHT = 64
+
+
+def aiohttp_is_available():
+    """
+    Check whether the optional aiohttp package is installed.
+
+    Returns:
+        bool: True if aiohttp can be used.
+    """
+    return aiohttp is not None
+
+
+class AsyncScraper(Scraper):
+    """
+    asyncio crawl engine with the same results, files and journal as Scraper.
+
+    Search and product pages are fetched by coroutines. A semaphore bounds the
+    requests in flight, and the per-host rate limiter is awaited rather than
+    slept on. With aiohttp installed, requests run natively on the event loop.
+    Without it they run on the pooled requests session through a thread pool
+    of max_in_flight threads, which works everywhere but costs a thread per
+    request again.
+    Parsing runs off the loop (or in the extraction process pool), and
+    persistence reuses Scraper's persistence stage.
+
+    Drive it with asyncio.run(scraper.crawl_async()), await it from an existing
+    loop, or call begin_scraping_process() from a plain thread. Cancelling the
+    crawl task cancels every in-flight request, releases their claims and
+    closes the journal, so a cancelled run can be resumed.
+    """
+
+    def __init__(self, update_progress_callback, max_in_flight=DEFAULT_MAX_IN_FLIGHT, use_aiohttp=None, **kwargs):
+        """
+        Initialize the engine.
+
+        Args:
+            update_progress_callback (callable): A function to call with scraping progress updates.
+            max_in_flight (int): Most requests (search and product) in flight at once.
+            use_aiohttp (bool | None): Fetch with aiohttp; None uses it when installed.
+            **kwargs: Any other Scraper argument (config, rate_limiter, cache, ...).
+
+        Raises:
+            RuntimeError: If use_aiohttp is True but aiohttp is not installed.
+        """
+        if use_aiohttp and not aiohttp_is_available():
+            raise RuntimeError("aiohttp is not installed (pip install aiohttp)")
+        if kwargs.get("session") is None:
+            # Enough pooled connections for the thread fallback's requests in flight
+            kwargs["session"] = create_session(max(1, int(max_in_flight)))
+        super().__init__(update_progress_callback, **kwargs)
+        self.max_in_flight = max(1, int(max_in_flight))
+        if kwargs.get("concurrency") is None and self.config.adaptive_concurrency:
+            # The ceiling of this engine is max_in_flight, not max_workers
+            self.concurrency = AdaptiveConcurrency(maximum=self.max_in_flight)
+        self.use_aiohttp = aiohttp_is_available() if use_aiohttp is None else use_aiohttp
+        self._semaphore = None     # Bounds requests in flight during a run
+        self._http = None          # aiohttp.ClientSession during a run
+        self._request_pool = None  # Threads running blocking requests when aiohttp is not used
+
+    def begin_scraping_process(self, resume=False):
+        """
+        Run the asyncio crawl to completion on a fresh event loop.
+
+        Args:
+            resume (bool): Continue an unfinished crawl from the journal (see Scraper).
+        """
+        asyncio.run(self.crawl_async(resume))
+
+    @property
+    def concurrency_limit(self):
+        """
+        Number of product requests currently allowed in flight.
+        """
+        return self.concurrency.limit if self.concurrency is not None else self.max_in_flight
+
+    async def wait_for_rate_limit(self, url):
+        """
+        Wait for the URL's host politeness budget without blocking the event loop.
+
+        Args:
+            url (str): URL about to be fetched.
+        """
+        delay = self.rate_limiter.bucket_for(url).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _request(self, url):
+        """
+        Send one GET request.
+
+        Args:
+            url (str): URL to fetch.
+
+        Returns:
+            requests.Response | SimpleNamespace: Object with status_code, headers, text and content.
+        """
+        if self._http is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._request_pool, lambda: self.session.get(url, headers=HEADERS, timeout=self.timeout)
+            )
+        async with self._http.get(url, headers=HEADERS) as response:
+            content = await response.read()
+            text = await response.text(errors="replace")  # Decodes the body read above
+            return SimpleNamespace(
+                status_code=response.status, headers=dict(response.headers), text=text, content=content
+            )
+
+    async def fetch_page_html_async(self, url, page_type="product"):
+        """
+        Fetch the raw HTML of a page, serving it from the cache when possible.
+
+        Same caching, recording, retry and failure reporting as fetch_page_html,
+        through the same check_cache, handle_response and retry_delay steps.
+
+        Args:
+            url (str): URL to fetch.
+            page_type (str): "search" or "product", used to pick the cache TTL.
+
+        Returns:
+            str | None: Page markup or None if request fails.
+        """
+        settled, html = self.check_cache(url, page_type)
+        if settled:
+            return html
+
+        transient = TRANSIENT_ERRORS + (asyncio.TimeoutError,)
+        if aiohttp is not None:
+            transient += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+        fatal = (requests.exceptions.RequestException,) + ((aiohttp.ClientError,) if aiohttp is not None else ())
+
+        attempt = 0
+        while True:
+            with self.metrics.timer("wait"):
+                await self.wait_for_rate_limit(url)
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    started = time.monotonic()
+                    response = await self._request(url)
+            except transient as error:
+                self.record_fetch(started)
+                reason = type(error).__name__
+            except fatal as error:
+                self.record_fetch(started)
+                self.report_failure(url, type(error).__name__)
+                return None
+            else:
+                html, reason, retry_after = self.handle_response(url, started, response)
+                if reason is None:
+                    return html
+
+            delay = self.retry_delay(url, reason, attempt, retry_after)
+            if delay is None:
+                return None
+            with self.metrics.timer("backoff"):
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def scrape_product_async(self, link, listing_record=None):
+        """
+        Fetch a single product detail page and extract its details (see scrape_product).
+
+        Args:
+            link (str): URL of the product detail page.
+            listing_record (dict | None): Partial record from the search result card.
+
+        Returns:
+            dict | None: Product information, or None if the page failed or was incomplete.
+        """
+        listing_record, complete = self.prepare_listing_record(link, listing_record)
+        if complete:
+            return listing_record
+
+        product_html = await self.fetch_page_html_async(link)
+        if product_html is None:
+            return None
+        # Parsing is CPU-bound; keep it off the event loop
+        product_data = await asyncio.to_thread(self.extract_product, product_html)
+        return self.complete_product(link, listing_record, product_data)
+
+    async def crawl_async(self, resume=False):
+        """
+        Run a whole crawl on the current event loop.
+
+        Args:
+            resume (bool): Continue an unfinished crawl from the journal (see Scraper).
+        """
+        summary_writer = self._start_run(resume)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        try:
+            self.start_extraction_pool()
+            if self.use_aiohttp:
+                connect_timeout, read_timeout = self.timeout
+                self._http = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self.max_in_flight),
+                    timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+                )
+            else:
+                self._request_pool = ThreadPoolExecutor(max_workers=self.max_in_flight)
+            await self._crawl_async(summary_writer)
+            self.journal.finish()
+        finally:
+            if self._http is not None:
+                await self._http.close()
+                self._http = None
+            if self._request_pool is not None:
+                self._request_pool.shutdown(wait=False, cancel_futures=True)
+                self._request_pool = None
+            self._end_run(summary_writer)
+
+    async def _crawl_async(self, summary_writer):
+        """
+        Run the listing task and the ordering loop, persisting results on a thread.
+
+        Args:
+            summary_writer (JsonSummaryWriter | JsonlSummaryWriter): Receives each saved product.
+        """
+        errors = []
+        page_queue = asyncio.Queue(maxsize=self.prefetch_pages)
+        # Unbounded: the ordering loop must never block the event loop on a put,
+        # and it can run at most target products ahead of the disk
+        persist_queue = queue.Queue()
+        self._queues = {"pages": page_queue, "persist": persist_queue}
+
+        persistence_stage = threading.Thread(
+            target=self._run_persistence_stage, args=(persist_queue, summary_writer, errors), daemon=True
+        )
+        persistence_stage.start()
+        listing_task = asyncio.create_task(self._run_listing_async(page_queue, errors))
+        try:
+            await self._consume_products_async(page_queue, persist_queue, errors)
+        finally:
+            listing_task.cancel()
+            await asyncio.gather(listing_task, return_exceptions=True)
+            persist_queue.put(None)
+            await asyncio.to_thread(persistence_stage.join)
+
+        if errors:
+            raise errors[0]
+
+    async def _run_listing_async(self, page_queue, errors):
+        """
+        Listing task: fetch search result pages in order and queue their product items.
+
+        Same page range, resume skipping and end-of-results rule as the threaded listing stage.
+
+        Args:
+            page_queue (asyncio.Queue): Receives (page_number, items) tuples, then None.
+            errors (list): Collects an unexpected exception for the crawl to raise.
+        """
+        page_number = int(self.config.start_page)
+        last_page = self.config.last_page
+        empty_pages = 0            # Consecutive pages without products
+        try:
+            while empty_pages < MAX_EMPTY_PAGES:
+                if last_page is not None and page_number > last_page:
+                    break
+                # Pages finished by an interrupted run are not fetched again
+                if page_number in self._crawl_state.pages_done:
+                    page_number += 1
+                    empty_pages = 0
+                    continue
+
+                html = await self.fetch_page_html_async(f"{self.base_url}&page={page_number}", page_type="search")
+                page_items = (
+                    await asyncio.to_thread(lambda: self.extract_page_items(self.parse_html(html)))
+                    if html else []
+                )
+                if page_items:
+                    empty_pages = 0
+                    await page_queue.put((page_number, page_items))
+                else:
+                    empty_pages += 1
+                page_number += 1
+        except Exception as error:
+            errors.append(error)
+        await page_queue.put(None)
+
+    async def _consume_products_async(self, page_queue, persist_queue, errors):
+        """
+        Ordering loop: schedule product coroutines and hand finished products on in link order.
+
+        Mirrors Scraper._consume_products, with tasks in place of futures and
+        max_in_flight in place of max_workers as the concurrency ceiling.
+
+        Args:
+            page_queue (asyncio.Queue): Pages produced by the listing task.
+            persist_queue (queue.Queue): Receives product and page events for the persistence stage.
+            errors (list): Exceptions of the other stages; scheduling stops at the first.
+        """
+        pending = deque()          # (page_number, claim, task) in flight, oldest first
+        self._queues["products"] = pending
+        pages = PageProgress(pending, persist_queue)
+        page_items = iter(())
+
+        try:
+            while self._accepted_products < self.target and not errors:
+                while len(pending) < min(self.concurrency_limit, self.target - self._accepted_products):
+                    item = next(page_items, None)
+                    if item is None:
+                        if pages.exhausted:
+                            break
+                        # Only wait for the next page when nothing else is in flight
+                        if pending and page_queue.empty():
+                            break
+                        page = await page_queue.get()
+                        if page is None:
+                            pages.end_of_pages()
+                            break
+                        page_number, items = page
+                        pages.start_page(page_number)
+                        page_items = iter(items)
+                        continue
+                    # Skip duplicates before spending a request on them
+                    claim = self.claim_product(item[0])
+                    if not claim:
+                        continue
+                    pending.append(
+                        (pages.current_page, claim, asyncio.create_task(self.scrape_product_async(*item)))
+                    )
+
+                if not pending:
+                    break  # Every page has been processed
+
+                # Stays in pending until it has a result, so a cancellation releases its claim too
+                result = await pending[0][2]
+                _, claim, _ = pending.popleft()
+                self._accept_result(claim, result, persist_queue)
+                pages.finish_pages()
+        finally:
+            # Target reached, failure or cancellation: stop what is still in flight
+            self._cancel_pending(pending)
+            await asyncio.gather(*(task for _, _, task in pending), return_exceptions=True)
+
@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import DEFAULT_BURST, DEFAULT_MAX_WORKERS, DEFAULT_RATE, RunConfig
+from dedupe import SeenIndex
+from rate_limiter import RateLimiter
+from scraper import Scraper, create_session
+
+# Folder receiving one sub-folder per query
+BATCH_FOLDER = "batch_output"
+
+# Index of ASINs collected by any query of any batch written to the batch folder
+BATCH_SEEN_ASINS_FILE = "seen_asins.txt"
+
+# Per-query results of the last run, written to the batch folder
+BATCH_REPORT_FILE = "batch_report.json"
+
+# Number of queries crawled at the same time
+DEFAULT_PARALLEL_QUERIES = 4
+
+
+def query_slug(query):
+    """
+    Turn a search query into a folder name.
+
+    Args:
+        query (str): Search keywords, e.g. "Foam Surfboards".
+
+    Returns:
+        str: Lowercase name made of letters, digits and dashes, e.g. "foam-surfboards".
+    """
+    return re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-") or "query"
+
+
+def load_batch(path, output_root=BATCH_FOLDER):
+    """
+    Build one RunConfig per query from a batch file.
+
+    The batch file is a JSON object with an optional "defaults" object of
+    RunConfig settings shared by every query, and a "queries" list. Each entry
+    is a query string or an object of settings (at least "query"), e.g.
+    {"defaults": {"target": 100}, "queries": ["surfboards", {"query": "wetsuits", "target": 300}]}.
+    Output paths not set explicitly go into output_root/<query slug>/.
+
+    Args:
+        path (str): Location of the batch file.
+        output_root (str): Folder receiving the per-query output folders.
+
+    Returns:
+        tuple[dict, list[RunConfig]]: Shared defaults and one config per query.
+    """
+    with open(path, "r", encoding="utf-8") as batch_file:
+        batch = json.load(batch_file)
+    defaults = dict(batch.get("defaults", {}))
+    configs = []
+    slugs = set()
+
+    for entry in batch.get("queries", []):
+        settings = dict(defaults, **({"query": entry} if isinstance(entry, str) else entry))
+        if not settings.get("query") and not settings.get("base_url"):
+            raise ValueError(f"Batch entry without a query: {entry!r}")
+
+        # Give every query its own folder, even when two share a name
+        slug = query_slug(settings.get("query") or settings["base_url"])
+        unique_slug, suffix = slug, 2
+        while unique_slug in slugs:
+            unique_slug, suffix = f"{slug}-{suffix}", suffix + 1
+        slugs.add(unique_slug)
+        folder = os.path.join(output_root, unique_slug)
+
+        settings.setdefault("output_folder", os.path.join(folder, "products"))
+        settings.setdefault("summary_file", os.path.join(folder, "products_summary.json"))
+        settings.setdefault("summary_jsonl_file", os.path.join(folder, "products_summary.jsonl"))
+        settings.setdefault("journal_file", os.path.join(folder, "crawl_journal.jsonl"))
+        settings.setdefault("database_file", os.path.join(folder, "products.db"))
+        settings.setdefault("metrics_file", os.path.join(folder, "run_metrics.json"))
+        configs.append(RunConfig(**settings))
+    return defaults, configs
+
+
+class BatchRunner:
+    """
+    Crawls several queries at once over shared resources.
+
+    All queries draw on one pool of detail-fetch workers, one pooled HTTP
+    session, one per-host rate limiter and one seen-ASIN index. Aggregate
+    concurrency and politeness are therefore set once for the whole batch,
+    while each query still writes its own product folder, summary and journal.
+    A product found by several queries is collected only once.
+    """
+
+    def __init__(
+        self,
+        configs,
+        max_workers=DEFAULT_MAX_WORKERS,
+        parallel_queries=DEFAULT_PARALLEL_QUERIES,
+        rate=DEFAULT_RATE,
+        burst=DEFAULT_BURST,
+        seen_index=None,
+        progress_callback=None,
+    ):
+        """
+        Initialize the runner and the resources its queries share.
+
+        Args:
+            configs (list[RunConfig]): One config per query, with distinct output paths.
+            max_workers (int): Detail pages fetched in parallel across all queries.
+            parallel_queries (int): Queries crawled at the same time.
+            rate (float): Requests per second allowed per host, for the whole batch.
+            burst (int): Requests allowed back to back per host.
+            seen_index (SeenIndex | None): ASIN index shared by the queries. Defaults to
+                an in-memory index.
+            progress_callback (callable | None): Called with (config, count, message)
+                for every progress update of any query.
+        """
+        self.configs = list(configs)
+        self.max_workers = max(1, int(max_workers))
+        self.parallel_queries = max(1, int(parallel_queries))
+        self.session = create_session(self.max_workers)
+        self.rate_limiter = RateLimiter(rate=rate, burst=burst)
+        self.seen_index = seen_index if seen_index is not None else SeenIndex()
+        self.progress_callback = progress_callback
+        self.scrapers = []
+
+    def create_scraper(self, config, executor):
+        """
+        Create the scraper of one query, wired to the shared resources.
+
+        Args:
+            config (RunConfig): Settings of the query.
+            executor (ThreadPoolExecutor): Shared detail-fetch pool.
+
+        Returns:
+            Scraper: Scraper for the query.
+        """
+        callback = lambda count, message: self.report_progress(config, count, message)
+        return Scraper(
+            callback,
+            config=config,
+            session=self.session,
+            rate_limiter=self.rate_limiter,
+            seen_index=self.seen_index,
+            executor=executor,
+        )
+
+    def report_progress(self, config, count, message):
+        """
+        Forward a query's progress update to the batch callback.
+
+        Args:
+            config (RunConfig): Query the update belongs to.
+            count (int): Products collected for the query so far.
+            message (str): Status message.
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(config, count, message)
+
+    def run(self, resume=False):
+        """
+        Crawl every query and return how each one went.
+
+        A failing query is reported in its result and does not stop the others.
+
+        Args:
+            resume (bool): Continue interrupted queries from their journals.
+
+        Returns:
+            list[dict]: Per query: query, search URL, target, collected count,
+            output folder and error (None on success), in batch order.
+        """
+        results = [None] * len(self.configs)
+        slots = threading.Semaphore(self.parallel_queries)
+
+        def crawl(position, scraper):
+            # Runs on a query thread; detail fetches go to the shared pool
+            error = None
+            try:
+                scraper.begin_scraping_process(resume=resume)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            finally:
+                scraper.storage.close()
+                slots.release()
+            results[position] = {
+                "query": scraper.config.query,
+                "search_url": scraper.base_url,
+                "target": scraper.target,
+                "collected": scraper.collected_products,
+                "output_folder": scraper.config.output_folder,
+                "error": error,
+            }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self.scrapers = [self.create_scraper(config, executor) for config in self.configs]
+            threads = []
+            for position, scraper in enumerate(self.scrapers):
+                slots.acquire()
+                thread = threading.Thread(target=crawl, args=(position, scraper), daemon=True)
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join()
+        return results
+
+
+def main(argv=None):
+    """
+    Command line entry point: crawl every query of a batch file.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        int: 0 if every query succeeded, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Scrape several search queries over one shared worker pool.")
+    parser.add_argument("batch", help="JSON batch file with \"defaults\" and \"queries\"")
+    parser.add_argument("--output-root", default=BATCH_FOLDER, help=f"Output folder (default {BATCH_FOLDER})")
+    parser.add_argument("--workers", type=int, help="Detail pages fetched in parallel across all queries")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL_QUERIES,
+                        help=f"Queries crawled at the same time (default {DEFAULT_PARALLEL_QUERIES})")
+    parser.add_argument("--rate", type=float, help="Requests per second per host for the whole batch")
+    parser.add_argument("--burst", type=int, help="Back-to-back requests per host for the whole batch")
+    parser.add_argument("--resume", action="store_true", help="Continue interrupted queries")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics of every query on http://127.0.0.1:PORT/metrics")
+    args = parser.parse_args(argv)
+
+    defaults, configs = load_batch(args.batch, args.output_root)
+    if not configs:
+        print("No queries in batch file.", file=sys.stderr)
+        return 1
+    os.makedirs(args.output_root, exist_ok=True)
+
+    lock = threading.Lock()
+
+    def report(config, count, message):
+        with lock:
+            print(f"[{config.query}] {count}/{config.target} {message}", file=sys.stderr)
+
+    runner = BatchRunner(
+        configs,
+        max_workers=args.workers or defaults.get("max_workers", DEFAULT_MAX_WORKERS),
+        parallel_queries=args.parallel,
+        rate=args.rate or defaults.get("rate", DEFAULT_RATE),
+        burst=args.burst or defaults.get("burst", DEFAULT_BURST),
+        seen_index=SeenIndex(os.path.join(args.output_root, BATCH_SEEN_ASINS_FILE)),
+        progress_callback=report,
+    )
+    metrics_port = args.metrics_port or defaults.get("metrics_port")
+    metrics_server = None
+    if metrics_port is not None:
+        from metrics_server import MetricsServer
+
+        metrics_server = MetricsServer(lambda: runner.scrapers, port=metrics_port).start()
+        print(f"Serving metrics on {metrics_server.url}", file=sys.stderr)
+    try:
+        results = runner.run(resume=args.resume)
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+
+    with open(os.path.join(args.output_root, BATCH_REPORT_FILE), "w", encoding="utf-8") as report_file:
+        json.dump(results, report_file, indent=2)
+    print(json.dumps(results, indent=2))
+    return 0 if all(result["error"] is None for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
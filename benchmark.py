@@ -0,0 +1,352 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import bs4
+from bs4 import BeautifulSoup
+
+from dedupe import SeenIndex
+from scraper import PRODUCT_PAGE_FILTER, Scraper, parser_is_available
+
+# Saved pages bundled with the repository
+FIXTURES_FOLDER = "fixtures"
+
+# Parser backends benchmarked when installed
+BACKENDS = ("html.parser", "lxml", "html5lib")
+
+# Markup inserted to scale pages up; mimics the review and carousel blocks that
+# make real product pages several hundred KB, and sits before the product fields
+FILLER_BLOCK = (
+    '<div class="a-section review aok-relative"><div class="a-row">'
+    '<a class="a-profile" href="/gp/profile/amzn1.account.FILLER"><span class="a-profile-name">Reviewer</span></a>'
+    '</div><div class="a-row"><i class="a-icon a-icon-star a-star-4"><span class="a-icon-alt">4.0 out of 5 stars</span></i>'
+    '<span class="a-size-base review-title">Solid choice for the price</span></div>'
+    '<div class="a-row a-spacing-small"><span class="a-size-base review-text">'
+    'Arrived quickly, inflated in ten minutes and held pressure all weekend. '
+    'The fins are a little flimsy but the board itself feels stable and well made.'
+    '</span></div><ul class="a-unordered-list"><li><span class="a-list-item">Helpful</span></li>'
+    '<li><span class="a-list-item">Report</span></li></ul></div>\n'
+)
+
+
+def load_pages(folders, pattern):
+    """
+    Read saved HTML pages from disk.
+
+    Args:
+        folders (list[str]): Folders to search.
+        pattern (str): Glob pattern selecting page files inside each folder.
+
+    Returns:
+        list[tuple[str, str]]: (path, html) pairs sorted by path.
+    """
+    pages = []
+    for folder in folders:
+        for path in sorted(glob.glob(os.path.join(folder, pattern))):
+            with open(path, "r", encoding="utf-8") as page_file:
+                pages.append((path, page_file.read()))
+    return pages
+
+
+def scale_page(html, factor):
+    """
+    Make a synthetic, larger copy of a page by inserting filler markup.
+
+    The filler goes right after the opening body tag, ahead of every field,
+    so extraction has to walk past it just as on a large real page.
+
+    Args:
+        html (str): Original page markup.
+        factor (int): Roughly how many times larger the result should be.
+
+    Returns:
+        str: Scaled page markup (the original when factor <= 1).
+    """
+    if factor <= 1:
+        return html
+    body_start = html.find("<body")
+    insert_at = html.find(">", body_start) + 1 if body_start != -1 else 0
+    copies = max(1, (len(html) * (factor - 1)) // len(FILLER_BLOCK))
+    return html[:insert_at] + FILLER_BLOCK * copies + html[insert_at:]
+
+
+def time_per_page(function, inputs, repeat):
+    """
+    Run a function over every input and report the best average time.
+
+    Args:
+        function (callable): Function called with each input.
+        inputs (list): Inputs for one round.
+        repeat (int): Number of timed rounds; the fastest round is reported.
+
+    Returns:
+        float: Seconds per input in the fastest round.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            function(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(inputs)
+
+
+def peak_memory(function, inputs):
+    """
+    Measure the largest Python heap peak while processing a single input.
+
+    Args:
+        function (callable): Function called with each input.
+        inputs (list): Inputs to measure.
+
+    Returns:
+        int: Peak traced allocation in bytes over all inputs.
+    """
+    peak = 0
+    for item in inputs:
+        tracemalloc.start()
+        try:
+            function(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return peak
+
+
+def make_result(backend, page_type, scale, case, pages, seconds, peak_bytes=None):
+    """
+    Build one machine-readable result row.
+
+    Args:
+        backend (str): Parser backend name.
+        page_type (str): "product" or "search".
+        scale (int): Synthetic size factor.
+        case (str): Name of the measured operation.
+        pages (int): Number of pages per timed round.
+        seconds (float): Seconds per page.
+        peak_bytes (int | None): Peak traced memory, if measured.
+
+    Returns:
+        dict: Result row for the JSON report.
+    """
+    return {
+        "backend": backend,
+        "page_type": page_type,
+        "scale": scale,
+        "case": case,
+        "pages": pages,
+        "ms_per_page": round(seconds * 1000, 4),
+        "pages_per_second": round(1 / seconds, 2) if seconds else None,
+        "peak_kib": round(peak_bytes / 1024, 1) if peak_bytes is not None else None,
+    }
+
+
+def benchmark_product_pages(scraper, backend, scale, pages, repeat, measure_memory):
+    """
+    Benchmark parsing and extraction of product detail pages.
+
+    Args:
+        scraper (Scraper): Scraper configured for the backend.
+        backend (str): Parser backend name.
+        scale (int): Synthetic size factor the pages were scaled by.
+        pages (list[tuple[str, str]]): (path, html) pairs.
+        repeat (int): Timed rounds per case.
+        measure_memory (bool): Also record peak memory for cases that parse markup.
+
+    Returns:
+        list[dict]: Result rows.
+    """
+    htmls = [html for _, html in pages]
+    full_parse = lambda html: BeautifulSoup(html, backend)
+    targeted_parse = lambda html: BeautifulSoup(html, backend, parse_only=PRODUCT_PAGE_FILTER)
+    soups = [full_parse(html) for html in htmls]
+
+    cases = [
+        ("parse_full", full_parse, htmls),
+        ("parse_targeted", targeted_parse, htmls),
+        ("extract_single_pass", scraper.extract_product_details, soups),
+        ("extract_multipass", scraper.extract_product_details_multipass, soups),
+        ("end_to_end", scraper.extract_product_html, htmls),
+    ]
+    results = []
+    for case, function, inputs in cases:
+        seconds = time_per_page(function, inputs, repeat)
+        peak = peak_memory(function, inputs) if measure_memory and inputs is htmls else None
+        results.append(make_result(backend, "product", scale, case, len(inputs), seconds, peak))
+    return results
+
+
+def benchmark_search_pages(scraper, backend, scale, pages, repeat, measure_memory):
+    """
+    Benchmark parsing and link/record extraction of search result pages.
+
+    Args:
+        scraper (Scraper): Scraper configured for the backend.
+        backend (str): Parser backend name.
+        scale (int): Synthetic size factor the pages were scaled by.
+        pages (list[tuple[str, str]]): (path, html) pairs.
+        repeat (int): Timed rounds per case.
+        measure_memory (bool): Also record peak memory for cases that parse markup.
+
+    Returns:
+        list[dict]: Result rows.
+    """
+    htmls = [html for _, html in pages]
+    parse = lambda html: BeautifulSoup(html, backend)
+    soups = [parse(html) for html in htmls]
+
+    cases = [
+        ("parse_full", parse, htmls),
+        ("extract_links", scraper.extract_product_links, soups),
+        ("extract_listing_records", scraper.extract_listing_records, soups),
+    ]
+    results = []
+    for case, function, inputs in cases:
+        seconds = time_per_page(function, inputs, repeat)
+        peak = peak_memory(function, inputs) if measure_memory and inputs is htmls else None
+        results.append(make_result(backend, "search", scale, case, len(inputs), seconds, peak))
+    return results
+
+
+def benchmark_fields(soups, repeat):
+    """
+    Time each product field lookup on its own, as run by the multi-pass extractor.
+
+    Args:
+        soups (list[BeautifulSoup]): Parsed product pages.
+        repeat (int): Timed rounds per field.
+
+    Returns:
+        dict: Field name mapped to milliseconds per page.
+    """
+    lookups = {
+        "product_name": lambda soup: soup.find(id="productTitle"),
+        "price": lambda soup: soup.select_one("span.a-price span.a-offscreen"),
+        "shipping_price": lambda soup: soup.find("span", class_="a-size-base a-color-secondary"),
+        "seller_name": lambda soup: soup.find("a", {"id": "sellerProfileTriggerId"}),
+        "brand": lambda soup: soup.find(class_="a-size-base po-break-word"),
+    }
+    return {
+        field: round(time_per_page(lookup, soups, repeat) * 1000, 4)
+        for field, lookup in lookups.items()
+    }
+
+
+def compare_to_baseline(results, baseline_path):
+    """
+    Print how each case moved relative to an earlier JSON report.
+
+    Args:
+        results (list[dict]): Result rows of this run.
+        baseline_path (str): Earlier report written by this script.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+
+    key = lambda row: (row["backend"], row["page_type"], row["scale"], row["case"])
+    previous = {key(row): row for row in baseline.get("results", [])}
+    for row in results:
+        before = previous.get(key(row))
+        if before and before["ms_per_page"]:
+            change = (row["ms_per_page"] / before["ms_per_page"] - 1) * 100
+            print(f"{'/'.join(map(str, key(row))):<60} {change:+7.1f}%", file=sys.stderr)
+
+
+def main(argv=None):
+    """
+    Run the parse-throughput benchmark suite and write a JSON report.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark page parsing and extraction on a corpus of saved search and product pages."
+    )
+    parser.add_argument("folders", nargs="*", default=[FIXTURES_FOLDER],
+                        help="Folders containing saved pages (default: fixtures)")
+    parser.add_argument("--product-pattern", default="product*.html", help="Glob selecting product pages")
+    parser.add_argument("--search-pattern", default="search*.html", help="Glob selecting search result pages")
+    parser.add_argument("--scales", default="1,4,16",
+                        help="Comma-separated size factors for synthetic scaled-up pages")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Parser backends to try if installed")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per case")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurement")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    product_pages = load_pages(args.folders, args.product_pattern)
+    search_pages = load_pages(args.folders, args.search_pattern)
+    if not product_pages and not search_pages:
+        print("No pages found.", file=sys.stderr)
+        return 1
+
+    scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+    backends = [name for name in args.backends.split(",") if parser_is_available(name)]
+    results = []
+    fields = {}
+
+    for backend in backends:
+        scraper = Scraper(lambda count, message: None, parser=backend, seen_index=SeenIndex())
+
+        # Both extractors must agree before their timings mean anything
+        for path, html in product_pages:
+            soup = BeautifulSoup(html, backend)
+            if scraper.extract_product_details(soup) != scraper.extract_product_details_multipass(soup):
+                print(f"Extractors disagree on {path} with {backend}", file=sys.stderr)
+                return 1
+
+        for scale in scales:
+            scaled_products = [(path, scale_page(html, scale)) for path, html in product_pages]
+            scaled_searches = [(path, scale_page(html, scale)) for path, html in search_pages]
+            if scaled_products:
+                results += benchmark_product_pages(
+                    scraper, backend, scale, scaled_products, args.repeat, not args.no_memory
+                )
+                soups = [BeautifulSoup(html, backend) for _, html in scaled_products]
+                fields[f"{backend}@{scale}"] = benchmark_fields(soups, args.repeat)
+            if scaled_searches:
+                results += benchmark_search_pages(
+                    scraper, backend, scale, scaled_searches, args.repeat, not args.no_memory
+                )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "beautifulsoup": bs4.__version__,
+            "repeat": args.repeat,
+        },
+        "corpus": {
+            "product_pages": len(product_pages),
+            "search_pages": len(search_pages),
+            "bytes": sum(len(html) for _, html in product_pages + search_pages),
+        },
+        "results": results,
+        "field_ms_per_page": fields,
+    }
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.baseline:
+        compare_to_baseline(results, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
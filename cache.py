@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+CACHE_FOLDER = "http_cache"
+
+# How long a cached page stays fresh, per page type, in seconds
+DEFAULT_TTLS = {
+    "search": 60 * 60,          # Search results change often
+    "product": 24 * 60 * 60,    # Product details are fairly stable
+}
+
+# Upper bound on the compressed size of the cache folder
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def normalize_url(url):
+    """
+    Normalize a URL so equivalent spellings share one cache entry.
+
+    The scheme and host are lowercased, the fragment is dropped and query
+    parameters are sorted.
+
+    Args:
+        url (str): URL to normalize.
+
+    Returns:
+        str: Normalized URL.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class ResponseCache:
+    """
+    Compressed on-disk cache of fetched pages with per-page-type TTLs.
+
+    Each entry is one zlib-compressed file named after the SHA-256 of the
+    normalized URL. Once the folder grows past max_bytes, the least recently
+    used entries are evicted. File modification times record use, so the LRU
+    order survives restarts. In offline mode the scraper never touches the
+    network and serves everything from the cache, so a whole dataset can be
+    re-extracted at parse speed.
+    """
+
+    def __init__(self, directory=CACHE_FOLDER, ttls=None, max_bytes=DEFAULT_MAX_BYTES, offline=False):
+        """
+        Initialize the cache and index the entries already on disk.
+
+        Args:
+            directory (str): Folder holding the cache files.
+            ttls (dict | None): Page type mapped to freshness in seconds; None means DEFAULT_TTLS.
+                In offline mode TTLs are ignored and every entry is served.
+            max_bytes (int): Size bound for all cache files together.
+            offline (bool): Cache-only mode; misses are not fetched from the network.
+        """
+        self.directory = directory
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        existing = []
+        for name in os.listdir(directory):
+            if name.endswith(".zz"):
+                stat = os.stat(os.path.join(directory, name))
+                existing.append((stat.st_mtime, name[:-3], stat.st_size))
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".zz")
+
+    @staticmethod
+    def key_for(url):
+        """
+        Compute the cache key of a URL.
+
+        Args:
+            url (str): URL of the page.
+
+        Returns:
+            str: Hex SHA-256 digest of the normalized URL.
+        """
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url, page_type="product"):
+        """
+        Return the cached body of a page if it is present and fresh.
+
+        Args:
+            url (str): URL of the page.
+            page_type (str): "search" or "product", selecting the TTL.
+
+        Returns:
+            str | None: Cached HTML, or None on a miss or an expired entry.
+        """
+        key = self.key_for(url)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                entry = json.loads(zlib.decompress(cache_file.read()))
+        except (OSError, ValueError, zlib.error):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        ttl = self.ttls.get(page_type)
+        if not self.offline and ttl is not None and time.time() - entry["fetched_at"] > ttl:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(path)  # Record the use for LRU ordering across runs
+        except OSError:
+            pass
+        return entry["body"]
+
+    def put(self, url, body):
+        """
+        Store a page body, evicting least recently used entries if needed.
+
+        Args:
+            url (str): URL of the page.
+            body (str): HTML to cache.
+        """
+        key = self.key_for(url)
+        data = zlib.compress(json.dumps({
+            "url": normalize_url(url),
+            "fetched_at": time.time(),
+            "body": body,
+        }).encode("utf-8"))
+
+        # Write to a temporary file first so readers never see a partial entry
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as cache_file:
+            cache_file.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def _evict(self):
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+        Must be called with the lock held.
+        """
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    @property
+    def hit_ratio(self):
+        """
+        Fraction of lookups served from the cache so far.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+
+from summary import open_for_append
+
+
+class CrawlState:
+    """
+    Progress of a crawl as reconstructed from its journal.
+    """
+
+    def __init__(self):
+        self.pages_done = set()         # Search pages whose products were all handled
+        self.completed_asins = set()    # Products saved so far
+        self.collected_products = 0     # Number of products saved so far
+        self.next_index = 1             # Index for the next product_<n>.json file
+        self.finished = False           # The crawl ran to completion
+        self.identity = None            # Search URL and outputs the crawl was started with
+
+    @property
+    def resumable(self):
+        """
+        Whether there is unfinished work to pick up.
+        """
+        return not self.finished and (self.collected_products > 0 or bool(self.pages_done))
+
+
+class CrawlJournal:
+    """
+    Append-only crawl journal used to resume after a crash or an early exit.
+
+    Each line is a JSON event: the start of the crawl (with what it searches
+    and where it writes), a search page that was fully handled, a product
+    that was saved (with its ASIN and output index), or the end of the crawl.
+    Every event is flushed and fsynced before the call returns, so the journal
+    never claims more than what is on disk. A truncated last line left by a
+    crash is ignored when the journal is loaded, and dropped before a resumed
+    crawl appends to it.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the journal.
+
+        Args:
+            path (str): Location of the journal file.
+        """
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Rebuild the crawl state from the journal on disk.
+
+        Returns:
+            CrawlState: State of the last crawl (empty if there is no journal).
+        """
+        state = CrawlState()
+        if not os.path.exists(self.path):
+            return state
+
+        with open(self.path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if event.get("event") == "start":
+                    state.identity = event.get("crawl")
+                elif event.get("event") == "page":
+                    state.pages_done.add(event["page"])
+                elif event.get("event") == "product":
+                    state.collected_products += 1
+                    state.next_index = max(state.next_index, event["index"] + 1)
+                    if event.get("asin"):
+                        state.completed_asins.add(event["asin"])
+                elif event.get("event") == "finish":
+                    state.finished = True
+        return state
+
+    def open(self, resume, identity=None):
+        """
+        Open the journal for writing.
+
+        Args:
+            resume (bool): Keep existing events; False starts a new journal.
+            identity (dict | None): What a new crawl searches and where it writes,
+                recorded so a later resume can check it continues the same crawl.
+        """
+        with self._lock:
+            self._file = open_for_append(self.path) if resume else open(self.path, "w", encoding="utf-8")
+        if not resume and identity is not None:
+            self._append({"event": "start", "crawl": identity})
+
+    def _append(self, event):
+        with self._lock:
+            self._file.write(json.dumps(event) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def page_done(self, page_number):
+        """
+        Record that every product of a search page has been handled.
+
+        Args:
+            page_number (int): Search results page number.
+        """
+        self._append({"event": "page", "page": page_number})
+
+    def product_saved(self, index, asin):
+        """
+        Record that a product has been written to disk.
+
+        Args:
+            index (int): Output index of the product file.
+            asin (str | None): ASIN of the product.
+        """
+        self._append({"event": "product", "index": index, "asin": asin})
+
+    def finish(self):
+        """
+        Record that the crawl completed normally.
+        """
+        self._append({"event": "finish"})
+
+    def close(self):
+        """
+        Close the journal file.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
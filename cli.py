@@ -0,0 +1,251 @@
+import argparse
+import sys
+import threading
+import time
+
+from config import RunConfig
+
+# Process exit codes
+EXIT_OK = 0              # Target reached
+EXIT_ERROR = 1           # The crawl failed
+EXIT_USAGE = 2           # Bad command line (argparse's own code)
+EXIT_INCOMPLETE = 3      # Search results ran out before the target was reached
+EXIT_INTERRUPTED = 130   # Stopped with Ctrl+C; rerun with --resume to continue
+
+
+class TextReporter:
+    """
+    Progress reporter printing one line per update, suited to logs and pipes.
+    """
+
+    def __init__(self, target, stream=None):
+        """
+        Initialize the reporter.
+
+        Args:
+            target (int): Number of products the run aims for.
+            stream (file | None): Where lines are written. Defaults to sys.stderr.
+        """
+        self.target = target
+        self.stream = stream if stream is not None else sys.stderr
+        self.start = time.monotonic()
+
+    def update(self, count, message):
+        """
+        Print a progress update.
+
+        Args:
+            count (int): Number of products collected so far.
+            message (str): Status message from the scraper.
+        """
+        elapsed = time.monotonic() - self.start
+        print(f"[{elapsed:7.1f}s] {count}/{self.target} {message}", file=self.stream, flush=True)
+
+    def close(self):
+        """
+        Nothing to release for plain text output.
+        """
+
+
+class TqdmReporter:
+    """
+    Progress reporter drawing a tqdm progress bar; requires the optional tqdm package.
+    """
+
+    def __init__(self, target):
+        """
+        Initialize the reporter and draw an empty bar.
+
+        Args:
+            target (int): Number of products the run aims for.
+        """
+        from tqdm import tqdm
+
+        self.bar = tqdm(total=target, unit="product", dynamic_ncols=True)
+
+    def update(self, count, message):
+        """
+        Move the bar to the current count and show the message.
+
+        Args:
+            count (int): Number of products collected so far.
+            message (str): Status message from the scraper.
+        """
+        if message.startswith("Fetch failed"):
+            self.bar.write(message)
+        else:
+            self.bar.set_postfix_str(message[:60], refresh=False)
+        self.bar.update(count - self.bar.n)
+
+    def close(self):
+        """
+        Finish the bar.
+        """
+        self.bar.close()
+
+
+class QuietReporter:
+    """
+    Progress reporter that discards every update.
+    """
+
+    def update(self, count, message):
+        pass
+
+    def close(self):
+        pass
+
+
+def tqdm_is_available():
+    """
+    Check whether the optional tqdm package can be imported.
+
+    Returns:
+        bool: True if tqdm is installed.
+    """
+    try:
+        import tqdm  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_reporter(kind, target):
+    """
+    Create the progress reporter for the --progress option.
+
+    Args:
+        kind (str): "auto", "tqdm", "text" or "none". "auto" uses tqdm when it is
+            installed and stderr is a terminal, and text lines otherwise.
+        target (int): Number of products the run aims for.
+
+    Returns:
+        TextReporter | TqdmReporter | QuietReporter: Reporter for the run.
+    """
+    if kind == "none":
+        return QuietReporter()
+    if kind == "auto":
+        kind = "tqdm" if tqdm_is_available() and sys.stderr.isatty() else "text"
+    if kind == "tqdm":
+        return TqdmReporter(target)
+    return TextReporter(target)
+
+
+def poll_stats(scraper, reporter, interval, stop):
+    """
+    Report the scraper's live metrics every interval seconds until stopped.
+
+    Args:
+        scraper (Scraper): Running scraper.
+        reporter (TextReporter | TqdmReporter | QuietReporter): Receives the status lines.
+        interval (float): Seconds between reports.
+        stop (threading.Event): Ends the loop when set.
+    """
+    while not stop.wait(interval):
+        reporter.update(scraper.collected_products, scraper.metrics.status_line())
+
+
+def run_gui(config):
+    """
+    Start the Kivy application; Kivy is only imported here.
+
+    Args:
+        config (RunConfig): Settings of the run.
+
+    Returns:
+        int: Process exit code.
+    """
+    from main import ScraperApp
+
+    ScraperApp(config=config).run()
+    return EXIT_OK
+
+
+def main(argv=None):
+    """
+    Headless command line entry point: scrape with the configured settings and report progress as text.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        int: Process exit code (see the EXIT_* constants).
+    """
+    parser = argparse.ArgumentParser(description="Scrape Amazon search results without a graphical interface.")
+    RunConfig.add_arguments(parser)
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted crawl from its journal")
+    parser.add_argument("--engine", choices=("threads", "asyncio"), default="threads",
+                        help="Crawl engine: worker threads, or asyncio coroutines (uses aiohttp if installed)")
+    parser.add_argument("--max-in-flight", type=int,
+                        help="Requests in flight at once with --engine asyncio (default 64)")
+    parser.add_argument("--progress", choices=("auto", "tqdm", "text", "none"), default="auto",
+                        help="Progress display (default: tqdm on a terminal if installed, else text)")
+    parser.add_argument("--stats-interval", type=float,
+                        help="Also report throughput and stage timings every this many seconds")
+    parser.add_argument("--gui", action="store_true", help="Open the graphical interface instead")
+    args = parser.parse_args(argv)
+
+    try:
+        config = RunConfig.from_args(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    if args.gui:
+        return run_gui(config)
+    if args.progress == "tqdm" and not tqdm_is_available():
+        parser.error("--progress tqdm needs the tqdm package (pip install tqdm)")
+
+    # Imported here so --help and --gui do not pay for the scraping stack
+    reporter = create_reporter(args.progress, config.target)
+    if args.engine == "asyncio":
+        from async_scraper import DEFAULT_MAX_IN_FLIGHT, AsyncScraper
+
+        scraper = AsyncScraper(reporter.update, max_in_flight=args.max_in_flight or DEFAULT_MAX_IN_FLIGHT,
+                               config=config)
+    else:
+        from scraper import Scraper
+
+        scraper = Scraper(reporter.update, config=config)
+    metrics_server = None
+    if config.metrics_port is not None:
+        from metrics_server import MetricsServer
+
+        try:
+            metrics_server = MetricsServer(lambda: [scraper], port=config.metrics_port).start()
+        except OSError as error:
+            parser.error(f"cannot serve metrics on port {config.metrics_port}: {error}")
+        print(f"Serving metrics on {metrics_server.url}", file=sys.stderr)
+    stop_stats = threading.Event()
+    if args.stats_interval:
+        threading.Thread(
+            target=poll_stats, args=(scraper, reporter, args.stats_interval, stop_stats), daemon=True
+        ).start()
+    try:
+        scraper.begin_scraping_process(resume=args.resume)
+    except KeyboardInterrupt:
+        reporter.close()
+        print(f"Interrupted after {scraper.collected_products} products; "
+              f"run again with --resume to continue.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except Exception as error:
+        reporter.close()
+        print(f"Scrape failed: {type(error).__name__}: {error}", file=sys.stderr)
+        return EXIT_ERROR
+    finally:
+        stop_stats.set()
+        if metrics_server is not None:
+            metrics_server.stop()
+        scraper.storage.close()
+    reporter.close()
+
+    if args.progress != "none":
+        print(scraper.metrics.report(), file=sys.stderr)
+
+    destination = config.database_file if config.storage == "sqlite" else config.output_folder
+    print(f"Collected {scraper.collected_products}/{config.target} products "
+          f"into {destination}", file=sys.stderr)
+    return EXIT_OK if scraper.collected_products >= config.target else EXIT_INCOMPLETE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
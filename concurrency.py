@@ -0,0 +1,160 @@
+import threading
+from collections import deque
+
+# Responses telling the client to slow down right away
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def percentile(values, fraction):
+    """
+    Return a percentile of a list of numbers (nearest rank).
+
+    Args:
+        values (list[float]): Samples; need not be sorted.
+        fraction (float): Percentile as a fraction, e.g. 0.9 for p90.
+
+    Returns:
+        float | None: The percentile, or None for an empty list.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD (additive increase, multiplicative decrease) controller for the number
+    of fetches in flight.
+
+    Every fetch reports its latency and outcome. After each window of samples
+    the controller compares the window's median latency with the best median
+    seen so far, and its error rate (non-200 or empty responses, network
+    errors) with max_error_rate. A healthy window raises the limit by
+    `increase`; an unhealthy one multiplies it by `decrease_factor`. A 429 or
+    503 cuts the limit immediately, at most once per window, so one burst of
+    throttling counts as one signal. The limit always stays within
+    [minimum, maximum].
+    """
+
+    def __init__(
+        self,
+        initial=None,
+        minimum=1,
+        maximum=32,
+        increase=1,
+        decrease_factor=0.5,
+        window=20,
+        max_error_rate=0.1,
+        latency_tolerance=2.0,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            initial (int | None): Starting limit. Defaults to a quarter of maximum,
+                so a crawl starts gently and earns its way up.
+            minimum (int): Lowest limit.
+            maximum (int): Highest limit; the crawl's worker count.
+            increase (int): Added to the limit after a healthy window.
+            decrease_factor (float): Multiplies the limit after an unhealthy window or throttling.
+            window (int): Samples per evaluation.
+            max_error_rate (float): Highest error fraction a healthy window may have.
+            latency_tolerance (float): How many times the best median latency a
+                window's median may reach before it counts as rising latency.
+        """
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.increase = max(1, int(increase))
+        self.decrease_factor = decrease_factor
+        self.window = max(1, int(window))
+        self.max_error_rate = max_error_rate
+        self.latency_tolerance = latency_tolerance
+        if initial is None:
+            initial = self.maximum // 4
+        self._limit = min(self.maximum, max(self.minimum, int(initial)))
+        self._latencies = deque(maxlen=self.window)
+        self._errors = deque(maxlen=self.window)
+        self._since_change = 0          # Samples since the limit last changed
+        self._baseline = None           # Best window median latency seen
+        self._last_reason = "start"
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self):
+        """
+        Number of fetches currently allowed in flight.
+        """
+        return self._limit
+
+    def record(self, latency, status=200, empty=False):
+        """
+        Report the outcome of one fetch and adapt the limit.
+
+        Args:
+            latency (float): Seconds the request took.
+            status (int | None): HTTP status, or None for a network error or timeout.
+            empty (bool): The response was a 200 without usable content.
+
+        Returns:
+            str | None: Why the limit changed (e.g. "HTTP 429"), or None if it did not.
+        """
+        with self._lock:
+            self._since_change += 1
+            self._latencies.append(latency)
+            self._errors.append(status != 200 or empty)
+
+            if status in THROTTLE_STATUSES:
+                if self._since_change >= self.window or self._last_reason not in ("HTTP 429", "HTTP 503"):
+                    return self._decrease(f"HTTP {status}")
+                return None
+
+            if self._since_change < self.window:
+                return None
+
+            median = percentile(list(self._latencies), 0.5)
+            error_rate = sum(self._errors) / len(self._errors)
+            if self._baseline is None or median < self._baseline:
+                self._baseline = median
+
+            if error_rate > self.max_error_rate:
+                return self._decrease(f"error rate {error_rate:.0%}")
+            if median > self._baseline * self.latency_tolerance:
+                return self._decrease(f"latency {median:.2f}s vs {self._baseline:.2f}s")
+            return self._set(self._limit + self.increase, "healthy")
+
+    def _decrease(self, reason):
+        return self._set(int(self._limit * self.decrease_factor), reason)
+
+    def _set(self, limit, reason):
+        """
+        Clamp and apply a new limit. Must be called with the lock held.
+
+        Returns:
+            str | None: The reason if the limit changed, otherwise None.
+        """
+        limit = min(self.maximum, max(self.minimum, limit))
+        self._since_change = 0
+        self._last_reason = reason
+        if limit == self._limit:
+            return None
+        self._limit = limit
+        return reason
+
+    def snapshot(self):
+        """
+        Return the controller's current state, e.g. for a progress display.
+
+        Returns:
+            dict: limit, p50 and p90 latency of the current window in seconds,
+            error_rate of the window and the reason of the last adjustment.
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                "limit": self._limit,
+                "p50": percentile(latencies, 0.5),
+                "p90": percentile(latencies, 0.9),
+                "error_rate": sum(self._errors) / len(self._errors) if self._errors else 0.0,
+                "reason": self._last_reason,
+            }
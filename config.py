@@ -0,0 +1,293 @@
+import argparse
+import json
+from urllib.parse import urlencode, urlsplit
+
+# Site searched when no explicit search URL is configured
+SEARCH_HOST = "https://www.amazon.com"
+
+# Defaults of a run: what to search for and how many products to collect
+DEFAULT_QUERY = "surfboards"
+DEFAULT_TARGET = 50
+
+# Default output locations, relative to the working directory
+OUTPUT_FOLDER = "amazon_products"
+SUMMARY_FILE = "products_summary.json"
+SUMMARY_JSONL_FILE = "products_summary.jsonl"
+SEEN_ASINS_FILE = "seen_asins.txt"
+JOURNAL_FILE = "crawl_journal.jsonl"
+DATABASE_FILE = "products.db"
+METRICS_FILE = "run_metrics.json"
+
+# Number of product detail pages fetched and parsed in parallel
+DEFAULT_MAX_WORKERS = 4
+
+# Number of search result pages fetched ahead of the page being consumed
+DEFAULT_PREFETCH_PAGES = 1
+
+# Politeness limits: requests per second and burst size per host
+DEFAULT_RATE = 0.5
+DEFAULT_BURST = 2
+
+
+def search_url(query, category=None, host=SEARCH_HOST):
+    """
+    Build the search results URL for a query.
+
+    Args:
+        query (str): Search keywords, e.g. "surfboards".
+        category (str | None): Optional search index (department) such as "sporting".
+        host (str): Scheme and host of the site.
+
+    Returns:
+        str: Search URL; the scraper appends "&page=N" to it.
+    """
+    params = {"k": query}
+    if category:
+        params["i"] = category
+    return f"{host}/s?{urlencode(params)}"
+
+
+BASE_URL = search_url(DEFAULT_QUERY)
+
+
+class RunConfig:
+    """
+    Settings of one scraping run: what to collect, how fast and where to write it.
+
+    A config can be built in code, loaded from a JSON file, or taken from the
+    command line (with a file as the starting point). ScraperApp and Scraper
+    read every run setting from here instead of module constants.
+    """
+
+    # Setting name mapped to its default value
+    FIELDS = {
+        "target": DEFAULT_TARGET,
+        "query": DEFAULT_QUERY,
+        "category": None,
+        "base_url": None,
+        "product_host": None,
+        "start_page": 1,
+        "max_pages": None,
+        "max_workers": DEFAULT_MAX_WORKERS,
+        "adaptive_concurrency": False,
+        "prefetch_pages": DEFAULT_PREFETCH_PAGES,
+        "extract_processes": 0,
+        "rate": DEFAULT_RATE,
+        "burst": DEFAULT_BURST,
+        "summary_mode": "json",
+        "storage": "json",
+        "output_folder": OUTPUT_FOLDER,
+        "database_file": DATABASE_FILE,
+        "summary_file": SUMMARY_FILE,
+        "summary_jsonl_file": SUMMARY_JSONL_FILE,
+        "seen_asins_file": SEEN_ASINS_FILE,
+        "journal_file": JOURNAL_FILE,
+        "metrics_file": METRICS_FILE,
+        "metrics_port": None,
+    }
+
+    def __init__(self, **settings):
+        """
+        Initialize the config, using defaults for anything not given.
+
+        Args:
+            **settings: Any of the names in FIELDS:
+                target (int): Number of products to collect.
+                query (str): Search keywords.
+                category (str | None): Search index (department) to restrict the search to.
+                base_url (str | None): Explicit search URL; overrides query and category.
+                product_host (str | None): Scheme and host product links are resolved
+                    against; None uses base_url's, or SEARCH_HOST without a base_url.
+                start_page (int): First search results page to fetch.
+                max_pages (int | None): Most search result pages to fetch; None means
+                    until the target is reached or the results run out.
+                max_workers (int): Product detail pages fetched in parallel.
+                adaptive_concurrency (bool): Let an AIMD controller pick how many of
+                    the max_workers fetches run at once (see AdaptiveConcurrency).
+                prefetch_pages (int): Search pages fetched ahead of consumption.
+                extract_processes (int): Worker processes parsing product pages;
+                    0 parses on the fetching threads.
+                rate (float): Requests per second allowed per host.
+                burst (int): Requests allowed back to back per host.
+                summary_mode (str): "json" or "jsonl" (see Scraper).
+                storage (str): "json" saves product_<n>.json files in output_folder;
+                    "sqlite" saves products into database_file.
+                output_folder (str): Folder receiving product_<n>.json files.
+                database_file (str): SQLite database used by the "sqlite" storage.
+                summary_file (str): JSON array summary.
+                summary_jsonl_file (str): JSON Lines summary used in "jsonl" mode.
+                seen_asins_file (str): Persistent index of collected ASINs.
+                journal_file (str): Crawl journal used to resume interrupted runs.
+                metrics_file (str | None): JSON report of stage timings and counters
+                    written at the end of every run; None writes none.
+                metrics_port (int | None): Local port serving live metrics in the
+                    Prometheus text format at /metrics; None serves none.
+
+        Raises:
+            ValueError: If a setting is unknown or out of range.
+        """
+        unknown = set(settings) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown config settings: {', '.join(sorted(unknown))}")
+        for name, default in self.FIELDS.items():
+            setattr(self, name, settings.get(name, default))
+
+        if int(self.target) < 1:
+            raise ValueError("target must be at least 1")
+        if int(self.start_page) < 1:
+            raise ValueError("start_page must be at least 1")
+        if self.max_pages is not None and int(self.max_pages) < 1:
+            raise ValueError("max_pages must be at least 1")
+        if int(self.extract_processes) < 0:
+            raise ValueError("extract_processes cannot be negative")
+        if self.summary_mode not in ("json", "jsonl"):
+            raise ValueError(f"Unknown summary mode: {self.summary_mode!r}")
+        if self.storage not in ("json", "sqlite"):
+            raise ValueError(f"Unknown storage: {self.storage!r}")
+
+    @property
+    def search_url(self):
+        """
+        Search results URL of the run: base_url if set, otherwise built from query and category.
+        """
+        return self.base_url or search_url(self.query, self.category)
+
+    @property
+    def product_url_host(self):
+        """
+        Scheme and host of product pages: product_host if set, otherwise that of
+        base_url, so a search on a local replay server fetches its products there too.
+        """
+        if self.product_host:
+            return self.product_host.rstrip("/")
+        if self.base_url:
+            parts = urlsplit(self.base_url)
+            if parts.scheme and parts.netloc:
+                return f"{parts.scheme}://{parts.netloc}"
+        return SEARCH_HOST
+
+    @property
+    def last_page(self):
+        """
+        Last search results page the run may fetch, or None for no limit.
+        """
+        if self.max_pages is None:
+            return None
+        return int(self.start_page) + int(self.max_pages) - 1
+
+    def to_dict(self):
+        """
+        Return the settings as a plain dictionary, e.g. to save next to the results.
+
+        Returns:
+            dict: Setting name mapped to value.
+        """
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def replace(self, **settings):
+        """
+        Return a copy of the config with some settings changed.
+
+        Args:
+            **settings: Settings to change.
+
+        Returns:
+            RunConfig: New config.
+        """
+        return RunConfig(**dict(self.to_dict(), **settings))
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load a config from a JSON object file. Missing settings keep their defaults.
+
+        Args:
+            path (str): Location of the JSON file.
+
+        Returns:
+            RunConfig: Loaded config.
+        """
+        with open(path, "r", encoding="utf-8") as config_file:
+            settings = json.load(config_file)
+        if not isinstance(settings, dict):
+            raise ValueError(f"{path} must contain a JSON object")
+        return cls(**settings)
+
+    @staticmethod
+    def add_arguments(parser):
+        """
+        Add the config options to a command line parser.
+
+        Options left out on the command line stay None, so from_args can tell
+        them apart from explicit values and fall back to the config file.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser to extend.
+        """
+        group = parser.add_argument_group("run configuration")
+        group.add_argument("--config", help="JSON file with run settings; command line options override it")
+        group.add_argument("--target", type=int, help=f"Products to collect (default {DEFAULT_TARGET})")
+        group.add_argument("--query", help=f"Search keywords (default {DEFAULT_QUERY!r})")
+        group.add_argument("--category", help="Search index (department) to search in")
+        group.add_argument("--base-url", help="Explicit search URL; overrides --query and --category")
+        group.add_argument("--product-host",
+                           help="Scheme and host of product pages (default: that of --base-url, else Amazon)")
+        group.add_argument("--start-page", type=int, help="First search results page (default 1)")
+        group.add_argument("--max-pages", type=int, help="Most search result pages to fetch")
+        group.add_argument("--workers", dest="max_workers", type=int,
+                           help=f"Detail pages fetched in parallel (default {DEFAULT_MAX_WORKERS})")
+        group.add_argument("--adaptive-concurrency", action="store_true", default=None,
+                           help="Adapt the parallel fetches to the site's latency and errors, up to --workers")
+        group.add_argument("--prefetch-pages", type=int,
+                           help=f"Search pages fetched ahead (default {DEFAULT_PREFETCH_PAGES})")
+        group.add_argument("--extract-processes", type=int,
+                           help="Worker processes parsing product pages (default 0: parse on the fetch threads)")
+        group.add_argument("--rate", type=float, help=f"Requests per second per host (default {DEFAULT_RATE})")
+        group.add_argument("--burst", type=int, help=f"Back-to-back requests per host (default {DEFAULT_BURST})")
+        group.add_argument("--summary-mode", choices=("json", "jsonl"), help="Summary format (default json)")
+        group.add_argument("--storage", choices=("json", "sqlite"),
+                           help="Save products as JSON files or into a SQLite database (default json)")
+        group.add_argument("--output-folder", help=f"Folder for product files (default {OUTPUT_FOLDER})")
+        group.add_argument("--database-file", help=f"SQLite database for --storage sqlite (default {DATABASE_FILE})")
+        group.add_argument("--summary-file", help=f"JSON summary file (default {SUMMARY_FILE})")
+        group.add_argument("--summary-jsonl-file", help=f"JSON Lines summary file (default {SUMMARY_JSONL_FILE})")
+        group.add_argument("--seen-asins-file", help=f"Index of collected ASINs (default {SEEN_ASINS_FILE})")
+        group.add_argument("--journal-file", help=f"Crawl journal (default {JOURNAL_FILE})")
+        group.add_argument("--metrics-file", help=f"Run timings and counters report (default {METRICS_FILE})")
+        group.add_argument("--metrics-port", type=int,
+                           help="Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics")
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        Build a config from parsed command line arguments.
+
+        Args:
+            args (argparse.Namespace): Arguments parsed with add_arguments options.
+
+        Returns:
+            RunConfig: The --config file (or the defaults) with command line overrides applied.
+        """
+        config = cls.from_file(args.config) if getattr(args, "config", None) else cls()
+        overrides = {
+            name: getattr(args, name)
+            for name in cls.FIELDS
+            if getattr(args, name, None) is not None
+        }
+        return config.replace(**overrides)
+
+    @classmethod
+    def parse_args(cls, argv=None, description=None):
+        """
+        Parse a command line made only of config options.
+
+        Args:
+            argv (list[str] | None): Command line arguments, defaults to sys.argv[1:].
+            description (str | None): Help text of the program.
+
+        Returns:
+            RunConfig: Parsed config.
+        """
+        parser = argparse.ArgumentParser(description=description)
+        cls.add_arguments(parser)
+        return cls.from_args(parser.parse_args(argv))
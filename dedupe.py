@@ -0,0 +1,85 @@
+import os
+import threading
+
+
+class SeenIndex:
+    """
+    Set of product ASINs that have already been saved, persisted across runs.
+
+    ASINs are appended to a plain text file (one per line) as soon as they are
+    added, so a crash never loses more than the product being written, and a
+    rerun skips everything an earlier run already collected.
+
+    Crawls sharing one index (e.g. a batch of queries) also share claims: an
+    ASIN claimed by one crawl is skipped by the others until it is released.
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize the index and load previously seen ASINs.
+
+        Args:
+            path (str | None): Location of the ASIN file. None keeps the index in memory only.
+        """
+        self.path = path
+        self._seen = set()
+        self._claimed = set()      # ASINs being scraped but not saved yet
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as seen_file:
+                self._seen.update(line.strip() for line in seen_file if line.strip())
+
+    def __contains__(self, asin):
+        with self._lock:
+            return asin in self._seen
+
+    def __len__(self):
+        with self._lock:
+            return len(self._seen)
+
+    def claim(self, asin):
+        """
+        Reserve an ASIN for scraping unless it was already saved or claimed.
+
+        Args:
+            asin (str): Amazon Standard Identification Number of the product.
+
+        Returns:
+            bool: True if the caller may scrape the product.
+        """
+        with self._lock:
+            if asin in self._seen or asin in self._claimed:
+                return False
+            self._claimed.add(asin)
+            return True
+
+    def release(self, asin):
+        """
+        Give up a claim without saving the product, so another crawl may try it.
+
+        Args:
+            asin (str): Previously claimed ASIN.
+        """
+        with self._lock:
+            self._claimed.discard(asin)
+
+    def add(self, asin):
+        """
+        Record an ASIN as collected.
+
+        Args:
+            asin (str): Amazon Standard Identification Number of the saved product.
+
+        Returns:
+            bool: True if the ASIN was new, False if it was already in the index.
+        """
+        with self._lock:
+            self._claimed.discard(asin)
+            if asin in self._seen:
+                return False
+            self._seen.add(asin)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as seen_file:
+                    seen_file.write(asin + "\n")
+            return True
@@ -1,4 +1,9 @@
+import os
 import threading
+
+# Leave the command line to RunConfig instead of Kivy's own option parser
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.anchorlayout import AnchorLayout
@@ -8,6 +13,7 @@ from kivy.uix.image import Image
 from kivy.clock import Clock
 from kivy.graphics import PushMatrix, PopMatrix, Rotate
 
+from config import RunConfig
 from scraper import Scraper
 
 class Spinner(Image):
@@ -67,6 +73,17 @@ class ScraperApp(App):
     and updates the UI with scraping progress.
     """
 
+    def __init__(self, config=None, **kwargs):
+        """
+        Initialize the application.
+
+        Args:
+            config (RunConfig | None): Settings of the scraping run. Defaults to RunConfig().
+        """
+        super().__init__(**kwargs)
+        # Not self.config: App.run() replaces that with Kivy's own ConfigParser
+        self.run_config = config if config is not None else RunConfig()
+
     def build(self):
         """
         Build and return the application's root widget (UI layout).
@@ -88,13 +105,27 @@ class ScraperApp(App):
         self.label = Label(text="Starting scrape...", font_size=42, size_hint_y=None, height=60)
         self.layout.add_widget(self.label)
 
-        # Progress bar with maximum of 50 items
-        self.progress = ProgressBar(max=50, size_hint_y=None, height=30)
+        # Progress bar with one step per product of the target
+        self.progress = ProgressBar(max=self.run_config.target, size_hint_y=None, height=30)
         self.layout.add_widget(self.progress)
 
-        # Initialize scraper with callback and start scraping in a background thread
-        self.scraper = Scraper(self.update_progress)
-        threading.Thread(target=self.scraper.begin_scraping_process, daemon=True).start()
+        # Initialize scraper with callback and start scraping in a background thread,
+        # picking up where an interrupted previous run stopped
+        self.scraper = Scraper(self.update_progress, config=self.run_config)
+        threading.Thread(
+            target=self.scraper.begin_scraping_process, kwargs={"resume": True}, daemon=True
+        ).start()
+
+        # Serve live metrics for Prometheus when a port is configured
+        if self.run_config.metrics_port is not None:
+            from metrics_server import MetricsServer
+
+            MetricsServer(lambda: [self.scraper], port=self.run_config.metrics_port).start()
+
+        # Live throughput and stage timings, plus the concurrency limit when it adapts
+        self.stats_label = Label(text="", font_size=20, size_hint_y=None, height=30)
+        self.layout.add_widget(self.stats_label)
+        Clock.schedule_interval(self.update_stats, 0.5)
 
         return self.layout
 
@@ -109,6 +140,16 @@ class ScraperApp(App):
         # Ensure UI updates occur on the main thread using Clock
         Clock.schedule_once(lambda dt: self._update_ui(count, message))
 
+    def update_stats(self, dt):
+        """
+        Refresh the stats label from the scraper's metrics and concurrency controller.
+        """
+        text = self.scraper.metrics.status_line()
+        if self.scraper.concurrency is not None:
+            state = self.scraper.concurrency.snapshot()
+            text += f" | parallel {state['limit']}/{self.scraper.max_workers} (errors {state['error_rate']:.0%})"
+        self.stats_label.text = text
+
     def _update_ui(self, count, message):
         """
         Helper method to update UI components safely from the main thread.
@@ -118,11 +159,11 @@ class ScraperApp(App):
             message (str): Status message.
         """
         self.progress.value = count
-        self.label.text = f"{message} ({count}/50 products)"
-        if count >= 50:
+        self.label.text = f"{message} ({count}/{self.run_config.target} products)"
+        if count >= self.run_config.target:
             self.spinner.stop_rotation()
 
 
 # Run the Kivy application
 if __name__ == "__main__":
-    ScraperApp().run()
+    ScraperApp(config=RunConfig.parse_args(description="Amazon product scraper with a graphical interface.")).run()
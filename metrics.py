@@ -0,0 +1,235 @@
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from concurrency import percentile
+
+# Samples kept per stage for percentiles; later samples replace kept ones at random
+MAX_SAMPLES = 4096
+
+# Stages in report order, with what each one times
+STAGES = {
+    "wait": "sleeping for the per-host rate limiter",
+    "fetch": "one HTTP request, from sending it to having the whole body",
+    "ttfb": "time to the response headers (connect, server time; response.elapsed)",
+    "download": "reading the body after the headers (fetch minus ttfb)",
+    "backoff": "sleeping before a retry",
+    "parse": "building a BeautifulSoup tree",
+    "extract": "turning a product page into a record, parse included",
+    "save": "writing one product to storage",
+    "flush": "committing a batch of saved products",
+    "summary": "adding one product to the summary file",
+}
+
+
+class Histogram:
+    """
+    Durations of one stage: exact count, total, min and max, plus a bounded
+    uniform sample (reservoir sampling) for percentiles.
+    """
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            max_samples (int): Most samples kept for percentiles.
+        """
+        self.max_samples = max_samples
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.samples = []
+
+    def observe(self, value):
+        """
+        Add one duration.
+
+        Args:
+            value (float): Seconds.
+        """
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.max_samples:
+                self.samples[slot] = value
+
+    def summary(self):
+        """
+        Summarize the histogram.
+
+        Returns:
+            dict: count, total, mean, min, p50, p90, p99 and max, in seconds.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": percentile(self.samples, 0.5),
+            "p90": percentile(self.samples, 0.9),
+            "p99": percentile(self.samples, 0.99),
+            "max": self.max,
+        }
+
+
+class RunMetrics:
+    """
+    Per-stage timers and counters of a crawl, safe to update from any thread.
+
+    The scraper times every stage listed in STAGES and counts requests,
+    responses by status, bytes, cache hits and saved products. snapshot()
+    can be polled while the run goes on; report() summarizes a finished run.
+
+    Connection reuse means DNS lookup and connect are not seen per request:
+    on a pooled connection they do not happen at all, and on a new one they
+    are part of ttfb.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty metrics; the run clock starts with start().
+        """
+        self._lock = threading.Lock()
+        self.start()
+
+    def start(self):
+        """
+        Clear everything and restart the run clock, at the start of a run.
+        """
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+            self.started = time.monotonic()
+            self.finished = None
+
+    def stop(self):
+        """
+        Stop the run clock, at the end of a run.
+        """
+        self.finished = time.monotonic()
+
+    @property
+    def elapsed(self):
+        """
+        Seconds since the run started, up to its end once stopped.
+        """
+        return (self.finished if self.finished is not None else time.monotonic()) - self.started
+
+    def observe(self, stage, seconds):
+        """
+        Record one duration of a stage.
+
+        Args:
+            stage (str): Stage name, normally one of STAGES.
+            seconds (float): Duration.
+        """
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        """
+        Time the body of a with block as one duration of a stage.
+
+        Args:
+            stage (str): Stage name.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def increment(self, counter, amount=1):
+        """
+        Add to a counter.
+
+        Args:
+            counter (str): Counter name, e.g. "requests" or "http_429".
+            amount (int): Amount to add.
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def snapshot(self):
+        """
+        Return the current metrics; cheap enough to poll from a UI.
+
+        Returns:
+            dict: elapsed seconds, counters, and stages mapping each timed stage
+            to its Histogram.summary().
+        """
+        with self._lock:
+            return {
+                "elapsed": self.elapsed,
+                "counters": dict(self.counters),
+                "stages": {name: histogram.summary() for name, histogram in self.histograms.items()},
+            }
+
+    def status_line(self, stages=("fetch", "parse", "extract", "save")):
+        """
+        Return a one-line live summary, for a progress display.
+
+        Args:
+            stages (tuple[str, ...]): Stages whose median duration is shown.
+
+        Returns:
+            str: E.g. "1.25 products/s | fetch p50 412ms | parse p50 9ms".
+        """
+        snapshot = self.snapshot()
+        saved = snapshot["counters"].get("products_saved", 0)
+        parts = [f"{saved / snapshot['elapsed'] if snapshot['elapsed'] else 0:.2f} products/s"]
+        for name in stages:
+            stage = snapshot["stages"].get(name)
+            if stage is not None:
+                parts.append(f"{name} p50 {stage['p50'] * 1000:.0f}ms")
+        return " | ".join(parts)
+
+    def report(self):
+        """
+        Return the metrics of the run as readable text, one line per stage.
+
+        Returns:
+            str: Report text.
+        """
+        snapshot = self.snapshot()
+        counters = snapshot["counters"]
+        saved = counters.get("products_saved", 0)
+        lines = [
+            f"Run time {snapshot['elapsed']:.1f}s, {saved} products "
+            f"({saved / snapshot['elapsed'] if snapshot['elapsed'] else 0:.2f}/s), "
+            f"{counters.get('requests', 0)} requests, {counters.get('bytes_downloaded', 0) / 1e6:.1f} MB",
+            f"{'stage':<9}{'count':>7}{'total s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+        ]
+        ordered = [name for name in STAGES if name in snapshot["stages"]]
+        ordered += sorted(set(snapshot["stages"]) - set(STAGES))
+        for name in ordered:
+            stage = snapshot["stages"][name]
+            lines.append(
+                f"{name:<9}{stage['count']:>7}{stage['total']:>10.2f}{stage['p50'] * 1000:>9.1f}"
+                f"{stage['p90'] * 1000:>9.1f}{stage['p99'] * 1000:>9.1f}{stage['max'] * 1000:>9.1f}"
+            )
+        lines.append("counters: " + ", ".join(f"{name}={value}" for name, value in sorted(counters.items())))
+        return "\n".join(lines)
+
+    def write_report(self, path):
+        """
+        Write the snapshot of the run to a JSON file.
+
+        Args:
+            path (str): Destination file.
+        """
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(self.snapshot(), report_file, indent=2)
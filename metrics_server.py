@@ -0,0 +1,187 @@
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Interface the endpoint binds by default; keep it off the network unless asked
+METRICS_HOST = "127.0.0.1"
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Stage duration quantiles exported as summaries
+QUANTILES = (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"))
+
+
+def _escape(value):
+    """
+    Escape a label value for the exposition format.
+    """
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value):
+    """
+    Format a sample value; None becomes NaN.
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _sample_line(name, labels, value):
+    """
+    Format one sample line, e.g. scraper_requests_total{query="surfboards"} 12.
+    """
+    label_text = ",".join(f"{key}=\"{_escape(text)}\"" for key, text in labels.items())
+    return f"{name}{{{label_text}}} {_format_value(value)}"
+
+
+def render_prometheus(scrapers):
+    """
+    Render the live metrics of some scrapers in the Prometheus text format.
+
+    Every sample carries a query label, so the crawls of a batch can be told apart:
+    the search query, or the whole search URL when the run was given one.
+
+    Args:
+        scrapers (iterable[Scraper]): Scrapers to export, running or finished.
+
+    Returns:
+        str: Exposition text, ending with a newline.
+    """
+    families = {}  # name -> (type, help, [lines])
+
+    def add(name, kind, help_text, labels, value):
+        families.setdefault(name, (kind, help_text, []))[2].append(_sample_line(name, labels, value))
+
+    for scraper in scrapers:
+        snapshot = scraper.metrics.snapshot()
+        counters = snapshot["counters"]
+        elapsed = snapshot["elapsed"]
+        # An explicit search URL overrides the query, which then keeps its default
+        base = {"query": scraper.base_url if scraper.config.base_url else scraper.config.query}
+
+        saved = counters.get("products_saved", 0)
+        add("scraper_products_saved_total", "counter", "Products saved to storage in this run.", base, saved)
+        add("scraper_products_per_second", "gauge", "Products saved per second, averaged over the run.",
+            base, saved / elapsed if elapsed else 0.0)
+        add("scraper_collected_products", "gauge", "Products collected, including those of a resumed run.",
+            base, scraper.collected_products)
+        add("scraper_target_products", "gauge", "Products the run aims for.", base, scraper.target)
+        add("scraper_run_seconds", "gauge", "Seconds since the run started.", base, elapsed)
+        add("scraper_pages_fetched_total", "counter", "Pages fetched successfully, from the network or cache.",
+            base, counters.get("pages_fetched", 0))
+        add("scraper_requests_total", "counter", "HTTP requests sent, retries included.",
+            base, counters.get("requests", 0))
+        add("scraper_bytes_downloaded_total", "counter", "Response body bytes downloaded.",
+            base, counters.get("bytes_downloaded", 0))
+
+        hits, misses = counters.get("cache_hits", 0), counters.get("cache_misses", 0)
+        add("scraper_cache_hits_total", "counter", "Pages served from the response cache.", base, hits)
+        add("scraper_cache_misses_total", "counter", "Cache lookups that went to the network.", base, misses)
+        add("scraper_cache_hit_ratio", "gauge", "Share of cache lookups served from the cache.",
+            base, hits / (hits + misses) if hits + misses else None)
+
+        for name in sorted(counters):
+            if name.startswith("http_"):
+                add("scraper_responses_total", "counter", "HTTP responses by status code.",
+                    dict(base, status=name[len("http_"):]), counters[name])
+        add("scraper_network_errors_total", "counter", "Requests that failed without a response.",
+            base, counters.get("network_errors", 0))
+        add("scraper_fetch_failures_total", "counter", "Pages given up on after retries.",
+            base, counters.get("fetch_failures", 0))
+
+        for queue_name, depth in sorted(scraper.queue_depths().items()):
+            add("scraper_queue_depth", "gauge", "Items waiting in each pipeline queue.",
+                dict(base, queue=queue_name), depth)
+        add("scraper_concurrency_limit", "gauge", "Detail fetches currently allowed in flight.",
+            base, scraper.concurrency_limit)
+
+        for stage, summary in sorted(snapshot["stages"].items()):
+            labels = dict(base, stage=stage)
+            for quantile, key in QUANTILES:
+                add("scraper_stage_seconds", "summary", "Duration of each pipeline stage.",
+                    dict(labels, quantile=quantile), summary[key])
+            add("scraper_stage_seconds_sum", None, None, labels, summary["total"])
+            add("scraper_stage_seconds_count", None, None, labels, summary["count"])
+
+    lines = []
+    for name, (kind, help_text, samples) in families.items():
+        if kind is not None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """
+    Local HTTP endpoint serving scraper metrics at /metrics for Prometheus.
+
+    The scrapers are looked up on every request, so a batch can add its
+    scrapers after the server has started.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, get_scrapers, host=METRICS_HOST, port=0):
+        """
+        Initialize the server.
+
+        Args:
+            get_scrapers (callable): Returns the scrapers to export.
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free port.
+        """
+        super().__init__((host, port), MetricsRequestHandler)
+        self.get_scrapers = get_scrapers
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        URL of the metrics page, e.g. http://127.0.0.1:9100/metrics.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        """
+        Serve requests on a background thread.
+
+        Returns:
+            MetricsServer: The running server, for chaining.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and release the socket.
+        """
+        self.shutdown()
+        self.server_close()
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers GET /metrics with the exposition text.
+    """
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        payload = render_prometheus(list(self.server.get_scrapers())).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the progress output
+        pass
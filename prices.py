@@ -0,0 +1,137 @@
+import re
+
+# Currency symbols as shown on the storefronts, longest first so "CA$" wins over "$"
+CURRENCY_SYMBOLS = {
+    "US$": "USD",
+    "CA$": "CAD",
+    "C$": "CAD",
+    "A$": "AUD",
+    "$": "USD",
+    "€": "EUR",
+    "£": "GBP",
+    "¥": "JPY",
+    "₹": "INR",
+}
+
+_SYMBOLS = "|".join(re.escape(symbol) for symbol in sorted(CURRENCY_SYMBOLS, key=len, reverse=True))
+
+# Amount with Indian lakh grouping ("1,23,456.50"), thousands separators
+# ("1,429.95", "1.429,95", "1 429") or none ("12345.67")
+_AMOUNT = (
+    r"(?:\d{1,2}(?:,\d{2})+,\d{3}(?:\.\d{1,2})?(?!\d)"
+    r"|\d{1,3}(?:[,.\s]\d{3})+(?:[.,]\d{1,2})?(?!\d)"
+    r"|\d+(?:[.,]\d{1,2})?)"
+)
+
+# A price with its currency symbol before ("$1,429.95") or after ("1.429,95 €") the amount
+PRICE_PATTERN = re.compile(
+    rf"(?P<before>{_SYMBOLS})\s?(?P<amount>{_AMOUNT})|(?P<amount_first>{_AMOUNT})\s?(?P<after>{_SYMBOLS})"
+)
+
+# Delivery text offering free shipping, e.g. "FREE delivery Sat, Jun 7"
+FREE_SHIPPING_PATTERN = re.compile(r"\bfree\b", re.IGNORECASE)
+
+# Words before an amount that is an order minimum, not a cost, e.g. "FREE delivery on $35 of items"
+THRESHOLD_PATTERN = re.compile(r"\b(?:on|over|above)\s*$", re.IGNORECASE)
+
+# Decimal part of an amount: a final "." or "," followed by one or two digits
+_DECIMALS = re.compile(r"[.,](\d{1,2})$")
+_DIGITS = re.compile(r"\D")
+
+
+def parse_amount(amount):
+    """
+    Convert a displayed amount into integer cents.
+
+    Args:
+        amount (str): Amount without currency, e.g. "1,429.95", "1.429,95" or "349".
+
+    Returns:
+        int | None: Amount in cents, or None if it has no digits.
+    """
+    amount = amount.strip()
+    decimals = _DECIMALS.search(amount)
+    if decimals:
+        whole, fraction = amount[:decimals.start()], decimals.group(1).ljust(2, "0")
+    else:
+        whole, fraction = amount, "00"
+    whole = _DIGITS.sub("", whole)
+    if not whole and not decimals:
+        return None
+    return int(whole or "0") * 100 + int(fraction)
+
+
+def parse_price(text):
+    """
+    Find the first price in a text.
+
+    Args:
+        text (str | None): Displayed text, e.g. "$349.99" or "Price shown at checkout.".
+
+    Returns:
+        tuple[int | None, str | None]: (amount in cents, ISO currency code), or
+        (None, None) when the text holds no price.
+    """
+    if not text:
+        return None, None
+    return _match_price(PRICE_PATTERN.search(text))
+
+
+def _match_price(match):
+    """
+    Convert a PRICE_PATTERN match into (cents, currency); (None, None) for no match.
+    """
+    if not match:
+        return None, None
+    symbol = match.group("before") or match.group("after")
+    cents = parse_amount(match.group("amount") or match.group("amount_first"))
+    if cents is None:
+        return None, None
+    return cents, CURRENCY_SYMBOLS[symbol]
+
+
+def parse_shipping(text):
+    """
+    Read the shipping cost from a delivery text.
+
+    Amounts introduced by "on", "over" or "above" are order minimums for free
+    delivery, not costs, and are skipped.
+
+    Args:
+        text (str | None): Delivery text, e.g. "$244.23 delivery Thursday" or "FREE delivery".
+
+    Returns:
+        tuple[int | None, str | None]: (cost in cents, ISO currency code); free
+        shipping is 0 cents without a currency, and (None, None) means unknown.
+    """
+    if not text:
+        return None, None
+    for match in PRICE_PATTERN.finditer(text):
+        if not THRESHOLD_PATTERN.search(text, 0, match.start()):
+            return _match_price(match)
+    if FREE_SHIPPING_PATTERN.search(text):
+        return 0, None
+    return None, None
+
+
+def price_fields(price_text, shipping_text):
+    """
+    Build the typed price and shipping fields of a product record.
+
+    Args:
+        price_text (str | None): Displayed price, None if the page shows none.
+        shipping_text (str | None): Raw delivery text, None if the page shows none.
+
+    Returns:
+        dict: price_cents (int | None), currency (str | None), price_available (bool),
+        shipping_cents (int | None) and shipping_available (bool).
+    """
+    price_cents, currency = parse_price(price_text)
+    shipping_cents, shipping_currency = parse_shipping(shipping_text)
+    return {
+        "price_cents": price_cents,
+        "currency": currency or shipping_currency,
+        "price_available": price_cents is not None,
+        "shipping_cents": shipping_cents,
+        "shipping_available": shipping_cents is not None,
+    }
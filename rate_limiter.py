@@ -0,0 +1,119 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Default politeness budget shared by every request to a host
+DEFAULT_REQUESTS_PER_SECOND = 0.5
+DEFAULT_BURST = 2
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that paces callers to a declared request rate.
+
+    Each call to acquire() reserves one token. When the bucket is empty the
+    reservation is still made (the balance goes negative), so concurrent
+    callers are queued fairly in arrival order and each sleeps only until its
+    own slot comes up.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate (float): Tokens added per second (requests per second).
+            burst (int): Maximum number of tokens that can accumulate while idle.
+            clock (callable): Monotonic time source, injectable for tests.
+            sleep (callable): Sleep function, injectable for tests.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Reserve one token without sleeping.
+
+        Returns:
+            float: Seconds the caller must wait before using its token.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """
+        Block until a token is available.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+
+class RateLimiter:
+    """
+    Per-host politeness scheduler.
+
+    Every fetch calls wait(url) first. Requests to the same host share one
+    token bucket, so the declared rate holds no matter how many worker
+    threads are fetching at once.
+    """
+
+    def __init__(self, rate=DEFAULT_REQUESTS_PER_SECOND, burst=DEFAULT_BURST):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate (float): Requests per second allowed for each host.
+            burst (int): Number of requests that may go out back to back after an idle period.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url):
+        """
+        Return the token bucket for the host of a URL, creating it on first use.
+
+        Args:
+            url (str): URL about to be fetched.
+
+        Returns:
+            TokenBucket: Bucket shared by all requests to that host.
+        """
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def wait(self, url):
+        """
+        Block until a request to the URL's host is allowed.
+
+        Args:
+            url (str): URL about to be fetched.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        return self.bucket_for(url).acquire()
@@ -0,0 +1,341 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Headers describing the original transfer, which no longer apply when replaying
+SKIPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "connection", "keep-alive"}
+
+
+def replay_key(url):
+    """
+    Key a URL by its path and sorted query, ignoring scheme and host.
+
+    This lets responses recorded from the live site be served from any
+    local address.
+
+    Args:
+        url (str): Absolute URL or path with query string.
+
+    Returns:
+        str: Path plus normalized query string.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return (parts.path or "/") + ("?" + query if query else "")
+
+
+class CassetteRecorder:
+    """
+    Captures every response fetched by the scraper into a compact archive.
+
+    The archive (a "cassette") is a gzip-compressed JSON Lines file with one
+    entry per response: URL, status code, headers and body.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the recorder and open the archive for writing.
+
+        Args:
+            path (str): Location of the cassette file, e.g. "run.cassette.jsonl.gz".
+        """
+        self.path = path
+        self.count = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(self, url, response):
+        """
+        Append one response to the cassette. Safe to call from worker threads.
+
+        Args:
+            url (str): URL that was requested.
+            response (requests.Response): Response received for it.
+        """
+        entry = json.dumps({
+            "url": url,
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "body": response.text,
+        }, ensure_ascii=False)
+        with self._lock:
+            self._file.write(entry + "\n")
+            self.count += 1
+
+    def close(self):
+        """
+        Flush and close the cassette.
+        """
+        with self._lock:
+            self._file.close()
+
+
+def load_cassette(path):
+    """
+    Read a cassette into a lookup table.
+
+    When a URL was recorded more than once, the last successful response wins.
+
+    Args:
+        path (str): Location of the cassette file.
+
+    Returns:
+        dict: replay_key(url) mapped to the recorded entry.
+    """
+    entries = {}
+    with gzip.open(path, "rt", encoding="utf-8") as cassette:
+        for line in cassette:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            key = replay_key(entry["url"])
+            if key not in entries or entry["status"] == 200 or entries[key]["status"] != 200:
+                entries[key] = entry
+    return entries
+
+
+def find_search_url(entries):
+    """
+    Find the search the cassette was recorded from.
+
+    Args:
+        entries (dict): Recorded responses, as returned by load_cassette.
+
+    Returns:
+        str | None: Path and query of the search without its page parameter,
+        or None unless the cassette holds the pages of exactly one search.
+    """
+    searches = set()
+    for key in entries:
+        parts = urlsplit(key)
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        if any(name == "page" for name, _ in params):
+            searches.add(parts.path + "?" + urlencode([(name, value) for name, value in params if name != "page"]))
+    return searches.pop() if len(searches) == 1 else None
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Local HTTP server that serves a cassette back to the scraper.
+
+    Latency and error injection are driven by a seeded random generator, so a
+    benchmark run against the same cassette and settings is repeatable.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, entries, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, seed=0):
+        """
+        Initialize the server.
+
+        Args:
+            entries (dict): Recorded responses, as returned by load_cassette.
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free port.
+            latency (float): Fixed delay in seconds added to every response.
+            jitter (float): Extra random delay in seconds, uniform in [0, jitter].
+            error_rate (float): Probability of answering with error_status instead of the recording.
+            error_status (int): Status code used for injected errors.
+            seed (int): Seed for the latency and error generator.
+        """
+        super().__init__((host, port), ReplayRequestHandler)
+        self.entries = entries
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests_served = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        Base URL of the running server, e.g. http://127.0.0.1:8123.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def plan_response(self):
+        """
+        Draw the delay and the injected error (if any) for one request.
+
+        Returns:
+            tuple[float, bool]: (delay in seconds, whether to inject an error).
+        """
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            inject_error = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay, inject_error
+
+    def start(self):
+        """
+        Serve requests on a background thread.
+
+        Returns:
+            ReplayServer: The running server, for chaining.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and release the socket.
+        """
+        self.shutdown()
+        self.server_close()
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers GET requests from the server's recorded entries.
+    """
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the live site
+
+    def do_GET(self):
+        delay, inject_error = self.server.plan_response()
+        if delay:
+            time.sleep(delay)
+
+        entry = self.server.entries.get(replay_key(self.path))
+        if inject_error:
+            status, headers, body = self.server.error_status, {}, "Injected error"
+        elif entry is None:
+            status, headers, body = 404, {}, "Not in cassette"
+        else:
+            status, headers, body = entry["status"], entry["headers"], entry["body"]
+
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            if name.lower() not in SKIPPED_HEADERS:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+
+def run_benchmark(args):
+    """
+    Time a full begin_scraping_process run against a replay server.
+
+    The run happens in a temporary working directory, so the real output
+    folder and summary files are left untouched. Retries back off for zero
+    seconds with seeded jitter, so with the same cassette and settings every
+    run sends the same requests and sees the same injected errors.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+        int: Process exit code.
+    """
+    from dedupe import SeenIndex
+    from rate_limiter import RateLimiter
+    from scraper import RetryPolicy, Scraper
+
+    entries = load_cassette(os.path.abspath(args.cassette))
+    search = args.base_url or find_search_url(entries)
+    if search is None:
+        print("Cannot tell which search the cassette holds; pass --base-url", file=sys.stderr)
+        return 2
+    search = urlsplit(search)
+
+    server = ReplayServer(
+        entries, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed,
+    ).start()
+    base_url = server.url + (search.path or "/") + "?" + search.query
+
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            scraper = Scraper(
+                lambda count, message: None,
+                max_workers=args.workers,
+                rate_limiter=RateLimiter(rate=args.rate, burst=args.workers),
+                seen_index=SeenIndex(),
+                retry_policy=RetryPolicy(backoff_base=0.0, seed=args.seed),
+                base_url=base_url,
+                product_host=server.url,
+            )
+            start = time.perf_counter()
+            scraper.begin_scraping_process()
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(previous_dir)
+            server.stop()
+
+    print(json.dumps({
+        "products": scraper.collected_products,
+        "requests": server.requests_served,
+        "seconds": round(elapsed, 3),
+        "products_per_second": round(scraper.collected_products / elapsed, 3) if elapsed else None,
+    }, indent=2))
+    return 0
+
+
+def main(argv=None):
+    """
+    Command line entry point: serve a cassette, or benchmark the scraper against it.
+
+    Args:
+        argv (list[str] | None): Command line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded scraper traffic from a local HTTP server.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("serve", "bench"):
+        subcommand = subcommands.add_parser(name)
+        subcommand.add_argument("cassette", help="Cassette recorded with CassetteRecorder")
+        subcommand.add_argument("--latency", type=float, default=0.0, help="Fixed delay per response (s)")
+        subcommand.add_argument("--jitter", type=float, default=0.0, help="Random extra delay per response (s)")
+        subcommand.add_argument("--error-rate", type=float, default=0.0, help="Fraction of injected 503 responses")
+        subcommand.add_argument("--seed", type=int, default=0, help="Seed for latency and error injection")
+    subcommands.choices["serve"].add_argument("--port", type=int, default=8000)
+    subcommands.choices["bench"].add_argument("--workers", type=int, default=4)
+    subcommands.choices["bench"].add_argument("--rate", type=float, default=1000.0,
+                                              help="Requests per second allowed by the rate limiter")
+    subcommands.choices["bench"].add_argument("--base-url",
+                                              help="Search URL or path to crawl; found in the cassette by default")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        return run_benchmark(args)
+
+    server = ReplayServer(
+        load_cassette(args.cassette), port=args.port,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed,
+    )
+    print(f"Replaying {len(server.entries)} responses on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,54 @@
+import multiprocessing
+import os
+import queue
 import random
+import threading
 import time
-import json
-import os
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, Tag
+from bs4.builder import builder_registry
+from bs4.filter import ElementFilter
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import unquote
+
+from checkpoint import CrawlJournal, CrawlState
+from concurrency import AdaptiveConcurrency
+from config import DEFAULT_MAX_WORKERS, RunConfig
+from dedupe import SeenIndex
+from metrics import RunMetrics
+from prices import price_fields
+from rate_limiter import RateLimiter
+from storage import create_storage
+from summary import JsonSummaryWriter, JsonlSummaryWriter, read_json_array
+
+# Constants (run settings such as the search URL and output paths live in RunConfig)
+PRODUCT_HOST = "https://www.amazon.com"
+
+# Dollar amount inside a delivery text, e.g. "$244.23 delivery Thursday"
+SHIPPING_PRICE_PATTERN = re.compile(r'\$[\d,]+\.\d{2}')
+
+# ASIN inside a product path (/dp/, /gp/product/ or /gp/aw/d/), also when URL-encoded in a sponsored link
+ASIN_PATTERN = re.compile(r"/(?:dp|gp/product|gp/aw/d)/([A-Z0-9]{10})(?=[/?&#]|$)")
+
+# Consecutive search pages without products after which the results are considered exhausted
+MAX_EMPTY_PAGES = 3
 
-# Constants
-BASE_URL = "https://www.amazon.com/surfboards/s?k=surfboards"
-OUTPUT_FOLDER = "amazon_products"
-SUMMARY_FILE = "products_summary.json"
+# HTML parser backends in order of preference: C-accelerated lxml first,
+# then the pure-Python parser that ships with the standard library
+PARSER_PREFERENCE = ("lxml", "html.parser")
+FALLBACK_PARSER = "html.parser"
+
+# Bundled product page every candidate parser must extract identically to the fallback
+PARSER_CHECK_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "product_page.html")
+
+# (connect, read) timeouts in seconds applied to every request
+DEFAULT_TIMEOUT = (5.0, 20.0)
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 # Custom HTTP headers to mimic a browser request
 HEADERS = {
@@ -26,75 +65,895 @@ HEADERS = {
     "Referer": "https://www.amazon.com/",
 }
 
+
+def create_session(pool_size=DEFAULT_MAX_WORKERS):
+    """
+    Build a long-lived HTTP session with a keep-alive connection pool.
+
+    Connections are reused across requests, so each host only pays for the
+    TCP and TLS handshake once per pooled connection instead of once per page.
+
+    Args:
+        pool_size (int): Maximum number of pooled connections per host.
+            Should be at least the number of concurrent workers.
+
+    Returns:
+        requests.Session: Session with browser headers and a tuned adapter mounted.
+    """
+    # One pooled connection per worker, plus one for the search page fetch.
+    # No adapter retries: RetryPolicy makes every retry, within its per-run budget
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=pool_size + 1,
+        max_retries=0,
+        pool_block=True,
+    )
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.headers["Connection"] = "keep-alive"
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Request errors worth retrying; ChunkedEncodingError is a connection reset while reading the body
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# Product page fields located by find_product_tags, in output order
+PRODUCT_FIELDS = ("product_name", "price", "shipping_price", "seller_name", "brand")
+
+# Full class attribute strings matched by the shipping and brand lookups
+SHIPPING_CLASS = "a-size-base a-color-secondary"
+BRAND_CLASS = "a-size-base po-break-word"
+
+# Fields a listing-mode record must have before it is used without a detail page fetch
+DEFAULT_REQUIRED_FIELDS = ("product_name", "price")
+
+# Fields a targeted parse must find; otherwise the page is reparsed as a full tree
+PARTIAL_PARSE_REQUIRED_FIELDS = ("product_name", "price")
+
+
+class ProductPageFilter(ElementFilter):
+    """
+    Parse filter that only materializes the subtrees holding product fields.
+
+    Passed as parse_only to BeautifulSoup, it keeps the title, buybox price,
+    shipping, seller and brand elements (with everything inside them) and
+    discards the rest of the page while it is being parsed.
+    """
+
+    @property
+    def includes_everything(self):
+        return False
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        """
+        Decide whether a top-level tag (and its subtree) is kept.
+
+        Args:
+            nsprefix (str | None): Namespace prefix of the tag.
+            name (str): Tag name.
+            attrs (dict | None): Raw attribute values of the tag.
+
+        Returns:
+            bool: True if the tag may contain one of the product fields.
+        """
+        if not attrs:
+            return False
+        if attrs.get("id") in ("productTitle", "sellerProfileTriggerId"):
+            return True
+
+        classes = attrs.get("class")
+        if not classes:
+            return False
+        class_string = classes if isinstance(classes, str) else " ".join(classes)
+        if name == "span" and "a-price" in class_string.split():
+            return True
+        return class_string == BRAND_CLASS or (name == "span" and class_string == SHIPPING_CLASS)
+
+    def allow_string_creation(self, string):
+        # Text outside the kept subtrees is never needed
+        return False
+
+
+# Shared, stateless filter used for targeted product page parses
+PRODUCT_PAGE_FILTER = ProductPageFilter()
+
+
+def _has_price_ancestor(tag):
+    """
+    Check whether a tag sits inside a span.a-price element.
+
+    Args:
+        tag (Tag): Tag whose ancestors are inspected.
+
+    Returns:
+        bool: True if any ancestor is a span with the a-price class.
+    """
+    for parent in tag.parents:
+        if parent.name == "span" and "a-price" in parent.get("class", ()):
+            return True
+    return False
+
+
+def find_product_tags(soup):
+    """
+    Locate every product field tag in a single walk over the parse tree.
+
+    Matches exactly what the individual lookups in
+    Scraper.extract_product_details_multipass return (the first match of each
+    in document order), but visits each node at most once and stops as soon
+    as every field has been found.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML of a product detail page.
+
+    Returns:
+        dict: Field name mapped to the matching Tag, or None when absent.
+    """
+    found = dict.fromkeys(PRODUCT_FIELDS)
+    missing = len(found)
+
+    for node in soup.descendants:
+        if not isinstance(node, Tag) or not node.attrs:
+            continue  # Every field is identified by an id or class attribute
+
+        attrs = node.attrs
+        name = node.name
+        node_id = attrs.get("id")
+        classes = attrs.get("class")
+
+        if node_id is not None:
+            if found["product_name"] is None and node_id == "productTitle":
+                found["product_name"] = node
+                missing -= 1
+            elif found["seller_name"] is None and name == "a" and node_id == "sellerProfileTriggerId":
+                found["seller_name"] = node
+                missing -= 1
+
+        if classes:
+            class_string = " ".join(classes) if isinstance(classes, list) else classes
+            if found["price"] is None and name == "span" and "a-offscreen" in classes:
+                if _has_price_ancestor(node):
+                    found["price"] = node
+                    missing -= 1
+            if found["shipping_price"] is None and name == "span" and class_string == SHIPPING_CLASS:
+                found["shipping_price"] = node
+                missing -= 1
+            if found["brand"] is None and class_string == BRAND_CLASS:
+                found["brand"] = node
+                missing -= 1
+
+        if not missing:
+            break
+
+    return found
+
+
+# Parser chosen for each preference order, so the self-check runs once per process
+_selected_parsers = {}
+_parser_selection_lock = threading.Lock()
+
+
+def parser_is_available(parser):
+    """
+    Check whether BeautifulSoup can use a parser backend in this environment.
+
+    Args:
+        parser (str): Parser name such as "lxml" or "html.parser".
+
+    Returns:
+        bool: True if a tree builder for the parser is installed.
+    """
+    return builder_registry.lookup(parser) is not None
+
+
+def extract_asin(href):
+    """
+    Extract the ASIN from a product link.
+
+    Sponsored results link through /sspa/click with the real product path
+    URL-encoded in a query parameter, so the link is decoded before matching.
+
+    Args:
+        href (str): Relative or absolute product link.
+
+    Returns:
+        str | None: Ten-character ASIN, or None if the link does not name one.
+    """
+    match = ASIN_PATTERN.search(unquote(href))
+    return match.group(1) if match else None
+
+
+def canonical_product_url(asin, host=PRODUCT_HOST):
+    """
+    Build the canonical detail page URL for an ASIN.
+
+    Args:
+        asin (str): Amazon Standard Identification Number.
+        host (str): Scheme and host serving product pages.
+
+    Returns:
+        str: URL of the form https://www.amazon.com/dp/<ASIN>.
+    """
+    return f"{host}/dp/{asin}"
+
+
+class RetryPolicy:
+    """
+    Bounded retry policy with jittered exponential backoff.
+
+    Each URL gets at most max_retries extra attempts, and the whole run shares
+    a retry budget so a bad patch of the site cannot stretch a run without limit.
+    """
+
+    def __init__(self, max_retries=3, backoff_base=1.0, backoff_max=30.0, retry_budget=50, seed=None):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries (int): Extra attempts allowed per URL.
+            backoff_base (float): Backoff ceiling in seconds for the first retry.
+            backoff_max (float): Upper bound in seconds for any single backoff.
+            retry_budget (int): Total retries allowed per run across all URLs.
+            seed (int | None): Seed for the backoff jitter; None draws a fresh one.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_budget = retry_budget
+        self._remaining = retry_budget
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """
+        Refill the retry budget at the start of a run.
+        """
+        with self._lock:
+            self._remaining = self.retry_budget
+
+    @property
+    def remaining(self):
+        """
+        Number of retries left in this run's budget.
+        """
+        return self._remaining
+
+    def consume(self):
+        """
+        Take one retry from the run budget.
+
+        Returns:
+            bool: True if a retry was available, False once the budget is spent.
+        """
+        with self._lock:
+            if self._remaining <= 0:
+                return False
+            self._remaining -= 1
+            return True
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Compute how long to wait before the next attempt ("full jitter").
+
+        Args:
+            attempt (int): Zero-based number of the attempt that just failed.
+            retry_after (float | None): Server-requested delay from a Retry-After header.
+
+        Returns:
+            float: Seconds to sleep.
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        with self._lock:
+            delay = self._random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+
+def parse_retry_after(response):
+    """
+    Read a Retry-After header given in seconds.
+
+    Args:
+        response (requests.Response): Response that may carry the header.
+
+    Returns:
+        float | None: Delay in seconds, or None if absent or not numeric.
+    """
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class PageProgress:
+    """
+    Tells the persistence stage when a search page has been fully handled.
+
+    A page is done once all of its items were scheduled and none of them is
+    still in flight. Shared by the ordering loops of both crawl engines.
+    """
+
+    def __init__(self, pending, persist_queue):
+        """
+        Initialize the tracker.
+
+        Args:
+            pending (deque): (page_number, claim, future or task) in flight, oldest first.
+            persist_queue (queue.Queue): Receives ("page", page_number) events.
+        """
+        self.pending = pending
+        self.persist_queue = persist_queue
+        self.current_page = None        # Page whose items are being scheduled
+        self.open_pages = deque()       # Pages with products not yet handled, in order
+        self.exhausted = False          # The listing stage has no more pages
+
+    def start_page(self, page_number):
+        """
+        Note that the items of a new page are being scheduled.
+
+        Args:
+            page_number (int): Search page number.
+        """
+        self.current_page = page_number
+        self.open_pages.append(page_number)
+        self.finish_pages()
+
+    def end_of_pages(self):
+        """
+        Note that the listing stage has no more pages.
+        """
+        self.exhausted = True
+        self.finish_pages()
+
+    def finish_pages(self):
+        """
+        Queue a page event for every leading page that is done.
+        """
+        open_pages, pending = self.open_pages, self.pending
+        while open_pages and (open_pages[0] != self.current_page or self.exhausted) and (
+            not pending or pending[0][0] != open_pages[0]
+        ):
+            self.persist_queue.put(("page", open_pages.popleft()))
+
+
 class Scraper:
     """
     Scraper class to fetch product details from Amazon and update progress via a UI callback.
     """
 
-    def __init__(self, update_progress_callback):
+    def __init__(
+        self,
+        update_progress_callback,
+        config=None,
+        max_workers=None,
+        session=None,
+        rate_limiter=None,
+        retry_policy=None,
+        timeout=DEFAULT_TIMEOUT,
+        summary_mode=None,
+        partial_parse=True,
+        parser=None,
+        listing_mode=False,
+        required_fields=DEFAULT_REQUIRED_FIELDS,
+        seen_index=None,
+        cache=None,
+        recorder=None,
+        base_url=None,
+        product_host=None,
+        prefetch_pages=None,
+        journal=None,
+        executor=None,
+        storage=None,
+        extract_processes=None,
+        concurrency=None,
+        metrics=None,
+    ):
         """
         Initialize the scraper.
 
         Args:
             update_progress_callback (callable): A function to call with scraping progress updates.
+            config (RunConfig | None): Run settings: target, search, page limits, concurrency
+                and output locations. Defaults to RunConfig().
+            max_workers (int | None): Maximum number of product detail pages fetched in parallel.
+                Overrides config.max_workers.
+            session (requests.Session | None): HTTP session shared by every fetch.
+                Defaults to a pooled keep-alive session sized for max_workers.
+            rate_limiter (RateLimiter | None): Per-host politeness scheduler every fetch waits on.
+                Defaults to a RateLimiter with config.rate and config.burst.
+            retry_policy (RetryPolicy | None): Retry and backoff settings for transient failures.
+            timeout (tuple[float, float]): (connect, read) timeouts in seconds for every request.
+            summary_mode (str | None): "json" rewrites config.summary_file after every product;
+                "jsonl" appends to config.summary_jsonl_file and writes config.summary_file
+                once at the end. Overrides config.summary_mode.
+            partial_parse (bool): Parse product pages with PRODUCT_PAGE_FILTER and only
+                build the full tree when a required field is missing.
+            parser (str | None): BeautifulSoup parser backend. Defaults to the fastest
+                installed backend that passes the self-check (see select_parser_backend).
+            listing_mode (bool): Build records from search result cards and only fetch
+                a detail page when one of required_fields is missing from the card.
+            required_fields (tuple[str, ...]): Fields a listing-mode record must have.
+            seen_index (SeenIndex | None): ASINs already collected, checked before any detail
+                fetch. Defaults to an index persisted in config.seen_asins_file, or to an
+                in-memory index with an offline cache, so re-extracting a cached run
+                is not skipped as duplicates of that run.
+            cache (ResponseCache | None): On-disk page cache consulted before the network.
+            recorder (CassetteRecorder | None): Captures every network response for later replay.
+            base_url (str | None): Search results URL; "&page=N" is appended for each page.
+                Overrides config.search_url.
+            product_host (str | None): Scheme and host that product links are resolved against.
+                Overrides config.product_host; see RunConfig.product_url_host for the default.
+            prefetch_pages (int | None): How many search result pages the listing stage may
+                fetch ahead of the page whose products are being scraped.
+                Overrides config.prefetch_pages.
+            journal (CrawlJournal | None): Crawl-state journal used to resume interrupted runs.
+                Defaults to a journal in config.journal_file.
+            executor (concurrent.futures.Executor | None): Worker pool shared with other
+                crawls for detail fetches. By default each crawl creates its own pool
+                of max_workers threads.
+            storage (ProductStorage | None): Where products are saved. Defaults to the
+                backend selected by config.storage.
+            extract_processes (int | None): Worker processes that parse product pages,
+                so extraction is not serialized on the GIL. 0 parses on the fetching
+                threads. Overrides config.extract_processes.
+            concurrency (AdaptiveConcurrency | None): Controller deciding how many detail
+                fetches run at once, fed with the outcome of every request. Defaults to
+                one capped at max_workers when config.adaptive_concurrency is set;
+                otherwise max_workers fetches always run.
+            metrics (RunMetrics | None): Stage timers and counters, reset at the start of
+                every run and written to config.metrics_file at its end.
         """
+        # Explicit arguments take precedence over the run config
+        overrides = {
+            "max_workers": max_workers,
+            "summary_mode": summary_mode,
+            "base_url": base_url,
+            "product_host": product_host,
+            "prefetch_pages": prefetch_pages,
+            "extract_processes": extract_processes,
+        }
+        config = config if config is not None else RunConfig()
+        self.config = config.replace(**{name: value for name, value in overrides.items() if value is not None})
+
         self.update_progress_callback = update_progress_callback
+        self.target = int(self.config.target)
+        self.max_workers = max(1, int(self.config.max_workers))
+        self.session = session if session is not None else create_session(self.max_workers)
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None
+            else RateLimiter(rate=self.config.rate, burst=self.config.burst)
+        )
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.timeout = timeout
+        self.summary_mode = self.config.summary_mode
+        self.partial_parse = partial_parse
+        self.parser = parser if parser is not None else self.select_parser_backend()
+        self.listing_mode = listing_mode
+        self.required_fields = tuple(required_fields)
+        if seen_index is None:
+            # Offline re-extraction revisits products the persisted index already lists
+            offline = cache is not None and cache.offline
+            seen_index = SeenIndex() if offline else SeenIndex(self.config.seen_asins_file)
+        self.seen_index = seen_index
+        self._claimed_asins = set()
+        self.cache = cache
+        self.recorder = recorder
+        self.base_url = self.config.search_url
+        self.product_host = self.config.product_url_host
+        self.prefetch_pages = max(1, int(self.config.prefetch_pages))
+        self.journal = journal if journal is not None else CrawlJournal(self.config.journal_file)
+        self._crawl_state = CrawlState()
+        self.executor = executor
+        self.storage = storage if storage is not None else create_storage(self.config)
+        self.extract_processes = int(self.config.extract_processes)
+        self.process_pool = None
+        self.concurrency = concurrency
+        if self.concurrency is None and self.config.adaptive_concurrency:
+            self.concurrency = AdaptiveConcurrency(maximum=self.max_workers)
+        self.metrics = metrics if metrics is not None else RunMetrics()
+        self._queues = {}          # Pipeline queues of the current run, by name
+        self.collected_products = 0          # Products stored by the persistence stage
+        self._accepted_products = 0          # Products handed to the persistence stage
+
+    def report_failure(self, url, reason):
+        """
+        Send a fetch failure to the progress callback instead of dropping it silently.
+
+        Args:
+            url (str): URL that could not be fetched.
+            reason (str): Short description of what went wrong.
+        """
+        self.metrics.increment("fetch_failures")
+        self.update_progress_callback(self.collected_products, f"Fetch failed ({reason}): {url}")
+
+    @property
+    def concurrency_limit(self):
+        """
+        Number of detail fetches currently allowed in flight.
+        """
+        return self.concurrency.limit if self.concurrency is not None else self.max_workers
+
+    def queue_depths(self):
+        """
+        Return how many items wait in each pipeline queue of the current run.
+
+        Returns:
+            dict: "pages" (search pages listed ahead), "products" (detail fetches
+            scheduled, in order) and "persist" (results not yet saved) mapped to
+            their length; empty before the first run.
+        """
+        return {
+            name: len(items) if isinstance(items, deque) else items.qsize()
+            for name, items in list(self._queues.items())
+        }
+
+    def record_fetch(self, started, response=None):
+        """
+        Record the outcome of one request in the metrics and the concurrency controller.
+
+        Args:
+            started (float): time.monotonic() when the request was sent.
+            response (requests.Response | None): The response, or None if the request raised.
+        """
+        duration = time.monotonic() - started
+        status = response.status_code if response is not None else None
+        self.metrics.observe("fetch", duration)
+        self.metrics.increment("requests")
+        if response is None:
+            self.metrics.increment("network_errors")
+        else:
+            self.metrics.increment(f"http_{status}")
+            self.metrics.increment("bytes_downloaded", len(response.content))
+            # Headers-received time; not available from every client
+            elapsed = getattr(response, "elapsed", None)
+            if elapsed is not None:
+                ttfb = min(elapsed.total_seconds(), duration)
+                self.metrics.observe("ttfb", ttfb)
+                self.metrics.observe("download", duration - ttfb)
+
+        if self.concurrency is None:
+            return
+        empty = status == 200 and not response.text.strip()
+        reason = self.concurrency.record(duration, status, empty)
+        if reason is not None:
+            self.update_progress_callback(
+                self.collected_products, f"Concurrency now {self.concurrency.limit} ({reason})"
+            )
+
+    def select_parser_backend(self, preference=PARSER_PREFERENCE):
+        """
+        Pick the fastest installed parser backend that extracts correctly.
+
+        The result is cached per preference order, so the self-check only runs
+        the first time a Scraper is created in a process.
 
-    def fetch_page_soup(self, url):
+        Args:
+            preference (tuple[str, ...]): Parser names, most preferred first.
+
+        Returns:
+            str: Name of the chosen parser backend.
+        """
+        preference = tuple(preference)
+        with _parser_selection_lock:
+            if preference not in _selected_parsers:
+                _selected_parsers[preference] = next(
+                    (parser for parser in preference
+                     if parser_is_available(parser) and self.check_parser_backend(parser)),
+                    FALLBACK_PARSER,
+                )
+            return _selected_parsers[preference]
+
+    def check_parser_backend(self, parser, fixture_path=PARSER_CHECK_FIXTURE):
+        """
+        Self-check that a parser backend extracts the bundled fixture page
+        exactly like the fallback parser, for both full and targeted parses.
+
+        Args:
+            parser (str): Parser backend to verify.
+            fixture_path (str): Saved product page used for the comparison.
+
+        Returns:
+            bool: True if the backend can be trusted.
+        """
+        if parser == FALLBACK_PARSER:
+            return True
+        try:
+            with open(fixture_path, "r", encoding="utf-8") as fixture_file:
+                html = fixture_file.read()
+        except OSError:
+            return False  # Nothing to verify against, stay on the fallback
+
+        for parse_only in (None, PRODUCT_PAGE_FILTER):
+            expected = self.format_product_details(
+                find_product_tags(BeautifulSoup(html, FALLBACK_PARSER, parse_only=parse_only))
+            )
+            actual = self.format_product_details(
+                find_product_tags(BeautifulSoup(html, parser, parse_only=parse_only))
+            )
+            if actual != expected or not expected["product_name"]:
+                return False
+        return True
+
+    def parse_html(self, html, parse_only=None):
+        """
+        Parse HTML into a BeautifulSoup object.
+
+        Args:
+            html (str): Page markup.
+            parse_only (ElementFilter | None): Restrict the tree to matching subtrees.
+
+        Returns:
+            BeautifulSoup: Parsed page content.
+        """
+        with self.metrics.timer("parse"):
+            return BeautifulSoup(html, self.parser, parse_only=parse_only)
+
+    def fetch_page_soup(self, url, page_type="product"):
         """
         Fetch the HTML content of a page and return a BeautifulSoup object.
 
         Args:
             url (str): URL to fetch.
+            page_type (str): "search" or "product", used to pick the cache TTL.
 
         Returns:
             BeautifulSoup | None: Parsed page content or None if request fails.
         """
-        try:
-            response = requests.get(url, headers=HEADERS)
-            if response.status_code == 200:
-                return BeautifulSoup(response.text, "html.parser")
-        except requests.exceptions.RequestException:
-            # Silently ignore network errors
-            pass
-        return None
+        html = self.fetch_page_html(url, page_type)
+        if html is None:
+            return None
+        return self.parse_html(html)
+
+    def fetch_page_html(self, url, page_type="product"):
+        """
+        Fetch the raw HTML of a page, serving it from the cache when possible.
+
+        Transient failures (connection errors, timeouts, 429 and 5xx responses)
+        are retried with jittered exponential backoff until either the per-URL
+        limit or the run's retry budget runs out. Every final failure is
+        reported to the progress callback.
+
+        Args:
+            url (str): URL to fetch.
+            page_type (str): "search" or "product", used to pick the cache TTL.
+
+        Returns:
+            str | None: Page markup or None if request fails.
+        """
+        settled, html = self.check_cache(url, page_type)
+        if settled:
+            return html
+
+        attempt = 0
+        while True:
+            # Wait for this host's politeness budget before sending the request
+            with self.metrics.timer("wait"):
+                self.rate_limiter.wait(url)
+            retry_after = None
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, headers=HEADERS, timeout=self.timeout)
+            except TRANSIENT_ERRORS as error:
+                self.record_fetch(started)
+                reason = type(error).__name__
+            except requests.exceptions.RequestException as error:
+                self.record_fetch(started)
+                self.report_failure(url, type(error).__name__)
+                return None
+            else:
+                html, reason, retry_after = self.handle_response(url, started, response)
+                if reason is None:
+                    return html
+
+            delay = self.retry_delay(url, reason, attempt, retry_after)
+            if delay is None:
+                return None
+            with self.metrics.timer("backoff"):
+                time.sleep(delay)
+            attempt += 1
+
+    def check_cache(self, url, page_type):
+        """
+        Look a page up in the response cache before fetching it.
+
+        Args:
+            url (str): URL about to be fetched.
+            page_type (str): "search" or "product", used to pick the cache TTL.
+
+        Returns:
+            tuple[bool, str | None]: (whether the fetch is settled without a request,
+            cached markup). An offline cache settles a miss as a reported failure.
+        """
+        if self.cache is None:
+            return False, None
+        html = self.cache.get(url, page_type)
+        if html is not None:
+            self.metrics.increment("cache_hits")
+            self.metrics.increment("pages_fetched")
+            return True, html
+        self.metrics.increment("cache_misses")
+        if self.cache.offline:
+            self.report_failure(url, "not in cache")
+            return True, None
+        return False, None
+
+    def handle_response(self, url, started, response):
+        """
+        Record a response and sort it into success, retryable failure or final failure.
+
+        Args:
+            url (str): URL that was requested.
+            started (float): time.monotonic() when the request was sent.
+            response (requests.Response): The response received.
+
+        Returns:
+            tuple[str | None, str | None, float | None]: (markup, retry reason,
+            Retry-After delay). The reason is None on success and on a final
+            failure, which is already reported; the markup is then set or None.
+        """
+        self.record_fetch(started, response)
+        if self.recorder is not None:
+            self.recorder.record(url, response)
+        if response.status_code == 200:
+            if self.cache is not None:
+                self.cache.put(url, response.text)
+            self.metrics.increment("pages_fetched")
+            return response.text, None, None
+        reason = f"HTTP {response.status_code}"
+        if response.status_code not in RETRY_STATUSES:
+            self.report_failure(url, reason)
+            return None, None, None
+        return None, reason, parse_retry_after(response)
+
+    def retry_delay(self, url, reason, attempt, retry_after=None):
+        """
+        Decide whether a transient failure is retried, and after how long.
+
+        Args:
+            url (str): URL that failed.
+            reason (str): Short description of the failure.
+            attempt (int): Zero-based number of the attempt that failed.
+            retry_after (float | None): Server-requested delay from a Retry-After header.
+
+        Returns:
+            float | None: Seconds to back off before retrying, or None once the
+            per-URL limit or the run's retry budget is spent (the failure is reported).
+        """
+        if attempt >= self.retry_policy.max_retries:
+            self.report_failure(url, f"{reason}, gave up after {attempt + 1} attempts")
+            return None
+        if not self.retry_policy.consume():
+            self.report_failure(url, f"{reason}, retry budget exhausted")
+            return None
+        return self.retry_policy.backoff(attempt, retry_after)
 
     def save_product_data(self, product_data, index):
         """
-        Save product details to a local JSON file.
+        Save product details to the configured storage.
 
         Args:
             product_data (dict): Extracted product information.
-            index (int): Product index used for filename.
+            index (int): Product index within the run, e.g. used for the filename.
+        """
+        self.storage.save(product_data, index)
+
+    def product_card_link(self, item):
+        """
+        Get the canonical detail page URL for a search result card.
+
+        The ASIN comes from the card's data-asin attribute, or failing that from
+        its link, and the URL is normalized to /dp/<ASIN> so the same product
+        reached through a sponsored or tracking link is recognized as a duplicate.
+
+        Args:
+            item (Tag): A div[data-component-type="s-search-result"] card.
+
+        Returns:
+            str | None: Product URL, or None if the card has no product link.
         """
-        if not os.path.exists(OUTPUT_FOLDER):
-            os.makedirs(OUTPUT_FOLDER)
-        filename = os.path.join(OUTPUT_FOLDER, f"product_{index}.json")
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(product_data, f, ensure_ascii=False, indent=2)
+        link_tag = item.find("a", class_="a-link-normal s-no-outline")
+        if not link_tag:
+            return None
+
+        asin = item.get("data-asin") or extract_asin(link_tag["href"])
+        if asin:
+            return canonical_product_url(asin, self.product_host)
+        return self.product_host + link_tag["href"]
 
     def extract_product_links(self, soup):
         """
         Extract product detail page links from a search result page.
 
+        Links are normalized to their canonical /dp/<ASIN> form and repeated
+        listings on the same page are dropped.
+
         Args:
             soup (BeautifulSoup): Parsed HTML of the search result page.
 
         Returns:
             list[str]: List of full product URLs.
         """
+        return [link for link, _ in self.extract_listing_records(soup, with_fields=False)]
+
+    def extract_listing_records(self, soup, with_fields=True):
+        """
+        Build product records straight from the cards of a search result page.
+
+        Cards carry the title, price and usually the delivery text. Fields a
+        card does not show (seller and brand, or a missing price) are None,
+        and so are the typed price or shipping fields when the card lacks that text.
+        Repeated listings of the same product on the page are dropped.
+
+        Args:
+            soup (BeautifulSoup): Parsed HTML of the search result page.
+            with_fields (bool): Read the card fields; False only collects the links.
+
+        Returns:
+            list[tuple[str, dict | None]]: (product URL, partial product record) pairs.
+        """
         if soup is None:
             return []
 
-        return [
-            "https://www.amazon.com" + item.find("a", class_="a-link-normal s-no-outline")["href"]
-            for item in soup.find_all("div", {"data-component-type": "s-search-result"})
-            if item.find("a", class_="a-link-normal s-no-outline")
-        ]
+        records = []
+        page_links = set()
+        for item in soup.find_all("div", {"data-component-type": "s-search-result"}):
+            link = self.product_card_link(item)
+            if link is None or link in page_links:
+                continue
+            page_links.add(link)
+
+            if not with_fields:
+                records.append((link, None))
+                continue
+
+            title_tag = item.find("h2")
+            price_tag = item.select_one("span.a-price span.a-offscreen")
+            delivery_tag = item.find(attrs={"data-cy": "delivery-recipe"})
+
+            price_text = price_tag.get_text(strip=True) if price_tag else None
+            delivery_text = delivery_tag.get_text(strip=True) if delivery_tag else None
+            record = {
+                "product_name": (title_tag.get_text(strip=True) or None) if title_tag else None,
+                "price": price_text,
+                "shipping_price": self.extract_shipping_price(delivery_text) if delivery_text else None,
+                "seller_name": None,
+                "brand": None,
+            }
+            record.update(price_fields(price_text, delivery_text))
+
+            # Unknown rather than unavailable, so a detail page fetch can fill them in
+            if price_text is None:
+                record.update(price_cents=None, currency=None, price_available=None)
+            if delivery_text is None:
+                record.update(shipping_cents=None, shipping_available=None)
+            records.append((link, record))
+        return records
+
+    def extract_page_items(self, soup):
+        """
+        Turn a search result page into the work items handed to scrape_product.
+
+        Args:
+            soup (BeautifulSoup): Parsed HTML of the search result page.
+
+        Returns:
+            list[tuple[str, dict | None]]: (product URL, listing record) pairs;
+            the listing record is None unless listing mode is enabled.
+        """
+        return self.extract_listing_records(soup, with_fields=self.listing_mode)
        
  # Extract the shipping price from a string containing the shipping info.
     def extract_shipping_price(self, shipping_text):       
-        match = re.search(r'\$[\d,]+\.\d{2}', shipping_text)
+        match = SHIPPING_PRICE_PATTERN.search(shipping_text)
         if match:
             return match.group(0)
         return "Shipping info not available"
@@ -103,97 +962,656 @@ class Scraper:
         """
         Extract relevant product details from a product page.
 
+        All fields are located in one pass over the tree by find_product_tags.
+
+        Args:
+            soup (BeautifulSoup): Parsed HTML of a product detail page.
+
+        Returns:
+            dict: Product information (name, price, shipping, seller, brand).
+        """
+        return self.format_product_details(find_product_tags(soup))
+
+    def extract_product_html(self, html):
+        """
+        Extract product details straight from the markup of a product page.
+
+        With partial parsing enabled only the product field subtrees are built.
+        If that misses one of PARTIAL_PARSE_REQUIRED_FIELDS the page is parsed
+        again as a full tree, so results never get worse than a full parse.
+
+        Args:
+            html (str): Markup of a product detail page.
+
+        Returns:
+            dict: Product information (name, price, shipping, seller, brand).
+        """
+        if self.partial_parse:
+            tags = find_product_tags(self.parse_html(html, PRODUCT_PAGE_FILTER))
+            if all(tags[field] is not None for field in PARTIAL_PARSE_REQUIRED_FIELDS):
+                return self.format_product_details(tags)
+        return self.extract_product_details(self.parse_html(html))
+
+    def extract_product(self, html):
+        """
+        Extract product details from page markup, in a worker process when a pool is running.
+
+        Only the UTF-8 bytes of the page go to the worker and only the small
+        product dict comes back; the parse tree never crosses processes.
+
+        Args:
+            html (str): Markup of a product detail page.
+
+        Returns:
+            dict: Product information, as returned by extract_product_html.
+        """
+        with self.metrics.timer("extract"):
+            if self.process_pool is None:
+                return self.extract_product_html(html)
+            return self.process_pool.submit(_extract_in_worker, html.encode("utf-8")).result()
+
+    def start_extraction_pool(self):
+        """
+        Start the extraction worker processes if extract_processes is set.
+
+        Workers are spawned rather than forked, since the crawl already runs
+        several threads whose locks a forked child could inherit mid-use.
+        """
+        if self.extract_processes > 0 and self.process_pool is None:
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.extract_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_extraction_worker,
+                initargs=(self.parser, self.partial_parse),
+            )
+
+    def stop_extraction_pool(self):
+        """
+        Shut the extraction worker processes down.
+        """
+        if self.process_pool is not None:
+            self.process_pool.shutdown(cancel_futures=True)
+            self.process_pool = None
+
+    def extract_product_details_multipass(self, soup):
+        """
+        Reference extractor running one independent search per field.
+
+        Kept as the baseline that the single-pass extractor is benchmarked and
+        checked against; produces the same result as extract_product_details.
+
         Args:
             soup (BeautifulSoup): Parsed HTML of a product detail page.
 
         Returns:
             dict: Product information (name, price, shipping, seller, brand).
         """
-        title_tag = soup.find(id="productTitle")
-        price_tag = soup.select_one("span.a-price span.a-offscreen")
-        shipping_tag = soup.find("span", class_="a-size-base a-color-secondary")
-        seller_name = soup.find('a', {'id': 'sellerProfileTriggerId'})
-        brand = soup.find(class_="a-size-base po-break-word")
-        
+        return self.format_product_details({
+            "product_name": soup.find(id="productTitle"),
+            "price": soup.select_one("span.a-price span.a-offscreen"),
+            "shipping_price": soup.find("span", class_=SHIPPING_CLASS),
+            "seller_name": soup.find('a', {'id': 'sellerProfileTriggerId'}),
+            "brand": soup.find(class_=BRAND_CLASS),
+        })
+
+    def format_product_details(self, tags):
+        """
+        Turn the located field tags into the product record, applying fallbacks.
+
+        Besides the display strings, the record carries typed fields parsed once
+        here: price_cents, currency, price_available, shipping_cents (0 for free
+        delivery) and shipping_available.
+
+        Args:
+            tags (dict): Field name mapped to its Tag, or None when absent.
+
+        Returns:
+            dict: Product information (name, price, shipping, seller, brand and typed price fields).
+        """
+        title_tag = tags["product_name"]
+        price_tag = tags["price"]
+        shipping_tag = tags["shipping_price"]
+        seller_name = tags["seller_name"]
+        brand = tags["brand"]
+
+        price_text = price_tag.get_text(strip=True) if price_tag else None
+        shipping_text = shipping_tag.get_text(strip=True) if shipping_tag else None
         shipping_price = (
-            self.extract_shipping_price(shipping_tag.get_text(strip=True)) 
+            self.extract_shipping_price(shipping_text)
             if shipping_tag else "Shipping info not available"
         )
 
-        return {
+        product_data = {
             "product_name": title_tag.get_text(strip=True) if title_tag else None,
-            "price": price_tag.get_text(strip=True) if price_tag else "Price shown at checkout.",
+            "price": price_text if price_tag else "Price shown at checkout.",
             "shipping_price": shipping_price,
             "seller_name": seller_name.get_text(strip=True) if seller_name else "Amazon.com",
             "brand": brand.get_text(strip=True) if brand else "Amazon",
         }
+        product_data.update(price_fields(price_text, shipping_text))
+        return product_data
+
+    def create_summary_writer(self, resume=False):
+        """
+        Create the summary writer for the configured summary mode.
+
+        Args:
+            resume (bool): Keep the records already in the summary instead of starting over.
+
+        Returns:
+            JsonSummaryWriter | JsonlSummaryWriter: Writer receiving one record per product.
+        """
+        summary_file = self.config.summary_file
+        if self.summary_mode == "jsonl":
+            return JsonlSummaryWriter(self.config.summary_jsonl_file, array_path=summary_file, append=resume)
+        return JsonSummaryWriter(summary_file, records=read_json_array(summary_file) if resume else None)
+
+    def scrape_product(self, link, listing_record=None):
+        """
+        Fetch a single product detail page and extract its details.
+
+        In listing mode the record built from the search result card is used
+        as is when it already has every required field; otherwise the detail
+        page is fetched and only the fields the card lacked are filled in.
+
+        This runs on the worker pool, so it must not touch shared state.
+
+        Args:
+            link (str): URL of the product detail page.
+            listing_record (dict | None): Partial record from the search result card.
+
+        Returns:
+            dict | None: Product information, or None if the page failed or was incomplete.
+        """
+        listing_record, complete = self.prepare_listing_record(link, listing_record)
+        if complete:
+            return listing_record
+
+        product_html = self.fetch_page_html(link)
+        if product_html is None:
+            return None
+        return self.complete_product(link, listing_record, self.extract_product(product_html))
+
+    def prepare_listing_record(self, link, listing_record):
+        """
+        Attach the ASIN to a listing-mode card record and check whether it needs a detail fetch.
+
+        Args:
+            link (str): URL of the product detail page.
+            listing_record (dict | None): Partial record from the search result card.
+
+        Returns:
+            tuple[dict | None, bool]: The record (None outside listing mode) and
+            whether it already has every required field.
+        """
+        if listing_record is None:
+            return None, False
+        listing_record = dict(listing_record, asin=extract_asin(link))
+        return listing_record, all(listing_record.get(field) is not None for field in self.required_fields)
+
+    def complete_product(self, link, listing_record, product_data):
+        """
+        Combine the details extracted from a product page with the card record, if any.
+
+        Args:
+            link (str): URL of the product detail page.
+            listing_record (dict | None): Record returned by prepare_listing_record.
+            product_data (dict): Details extracted from the detail page.
+
+        Returns:
+            dict | None: Product information, or None if the product has no name.
+        """
+        if listing_record is not None:
+            # Card values win; the detail page only fills what the card lacked
+            product_data = {
+                field: value if value is not None else product_data.get(field)
+                for field, value in listing_record.items()
+            }
+        else:
+            product_data["asin"] = extract_asin(link)
+        if not product_data.get("product_name"):
+            return None  # Skip incomplete entries
+        return product_data
 
-    def begin_scraping_process(self):
+    def claim_product(self, link):
+        """
+        Decide whether a product link should be scraped, before any detail fetch.
+
+        Products saved in this or an earlier run, and products already in flight
+        here or in another crawl sharing the seen index, are skipped. Links without a recognizable ASIN are always scraped.
+
+        Args:
+            link (str): Product URL from the search results.
+
+        Returns:
+            str | bool: The claimed ASIN, True for links without an ASIN,
+            or False if the product is a duplicate.
+        """
+        asin = extract_asin(link)
+        if asin is None:
+            return True
+        if asin in self._claimed_asins or not self.seen_index.claim(asin):
+            return False
+        self._claimed_asins.add(asin)
+        return asin
+
+    def create_output_folders(self):
+        """
+        Create the folders holding the configured output files, if they are missing.
+        """
+        config = self.config
+        paths = (config.summary_file, config.summary_jsonl_file, config.seen_asins_file, config.journal_file,
+                 config.metrics_file)
+        folders = {os.path.dirname(path) for path in paths if path}
+        if config.storage == "json":
+            folders.add(config.output_folder)
+        for folder in folders:
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+
+    def begin_scraping_process(self, resume=False):
         """
         Start the scraping process.
 
-        - Iterates through Amazon search result pages.
-        - Extracts product links and details.
-        - Saves data to disk.
-        - Notifies the UI with progress updates.
-        - Stops after 50 products are collected or pages are exhausted.
+        The crawl runs as a pipeline of stages connected by bounded queues:
+
+        - Listing stage: fetches search result pages and extracts their product
+          links, staying up to prefetch_pages pages ahead of consumption.
+        - Detail stage: fetches and extracts product pages on a bounded worker pool.
+        - Ordering stage (this thread): consumes results in the original link order
+          and stops once the target number of products is collected or pages are exhausted.
+        - Persistence stage: saves products, streams them to the summary writer,
+          records progress in the crawl journal and notifies the UI.
+
+        Args:
+            resume (bool): If the journal shows an unfinished crawl, continue it:
+                finished pages are not refetched, saved products are skipped and
+                numbering continues from the next output index. Otherwise a new
+                crawl is started. A new crawl still keeps the summary and numbers
+                its products after the stored ones when the seen index already
+                lists products, since those are never fetched again.
+        """
+        summary_writer = self._start_run(resume)
+        try:
+            self.start_extraction_pool()
+            self._crawl(summary_writer)
+            self.journal.finish()
+        finally:
+            self._end_run(summary_writer)
+
+    def _start_run(self, resume):
         """
-        collected_products = 0     # Total products collected
-        page_number = 1            # Start at page 1
-        all_products = []          # Summary data
+        Reset the run state, restoring it from the journal when resuming.
 
-        while collected_products < 50:
-            # Construct the URL for the current page
-            url = f"{BASE_URL}&page={page_number}"
-            soup = self.fetch_page_soup(url)
+        Args:
+            resume (bool): Continue an unfinished crawl if the journal has one.
 
-            if not soup:
-                page_number += 1
-                continue
+        Returns:
+            JsonSummaryWriter | JsonlSummaryWriter: Summary writer for the run.
+        """
+        state = self.journal.load() if resume else CrawlState()
+        identity = self.crawl_identity()
+        mismatch = state.resumable and state.identity != identity
+        resume = state.resumable and not mismatch
+        if not resume:
+            state = CrawlState()
 
-            # Extract links to individual product pages
-            product_links = self.extract_product_links(soup)
-            if not product_links:
-                page_number += 1
-                continue
+        self.create_output_folders()
+        # Products in the seen index are skipped for good, so their outputs must
+        # stay: keep the summary and number new products after the stored ones
+        keep_outputs = resume or len(self.seen_index) > 0
+        if not resume and keep_outputs:
+            state.next_index = self.storage.next_index()
+        self.metrics.start()
+        self._crawl_state = state
+        self.collected_products = state.collected_products    # Total products collected
+        self._accepted_products = state.collected_products
+        self.retry_policy.reset()                              # Fresh retry budget for this run
+        self._claimed_asins = set(state.completed_asins)       # ASINs scheduled or already saved
+        summary_writer = self.create_summary_writer(keep_outputs)
+        self.journal.open(resume, identity)
+
+        if mismatch:
+            self.update_progress_callback(
+                self.collected_products, "Journal belongs to another search or output; starting a new crawl"
+            )
+        if resume:
+            self.update_progress_callback(self.collected_products, "Resuming previous crawl...")
+        return summary_writer
+
+    def crawl_identity(self):
+        """
+        Describe what this scraper searches and where it writes.
+
+        A journal is only resumed when it was started with the same identity,
+        so a different query never inherits another crawl's pages and numbering.
 
-            # Loop through each product link and scrape details
-            for link in product_links:
-                if collected_products >= 50:
+        Returns:
+            dict: search_url, product_host, storage, output (folder or database) and summary files.
+        """
+        config = self.config
+        return {
+            "search_url": self.base_url,
+            "product_host": self.product_host,
+            "storage": config.storage,
+            "output": os.path.normpath(config.database_file if config.storage == "sqlite" else config.output_folder),
+            "summary_file": os.path.normpath(config.summary_file),
+            "summary_jsonl_file": os.path.normpath(config.summary_jsonl_file),
+        }
+
+    def _end_run(self, summary_writer):
+        """
+        Release what a run holds, whether it finished or failed.
+
+        Args:
+            summary_writer (JsonSummaryWriter | JsonlSummaryWriter): Summary writer of the run.
+        """
+        self.stop_extraction_pool()
+        self.journal.close()
+        summary_writer.finalize()
+        self.metrics.stop()
+        if self.config.metrics_file:
+            # The report is a by-product: never let it fail, or mask the failure of, the crawl
+            try:
+                self.metrics.write_report(self.config.metrics_file)
+            except OSError as error:
+                self.update_progress_callback(
+                    self.collected_products, f"Could not write metrics report ({type(error).__name__}): {error}"
+                )
+
+    def _crawl(self, summary_writer):
+        """
+        Run the crawl pipeline of begin_scraping_process.
+
+        Args:
+            summary_writer (JsonSummaryWriter | JsonlSummaryWriter): Receives each saved product.
+        """
+        stop = threading.Event()
+        errors = []
+        page_queue = queue.Queue(maxsize=self.prefetch_pages)
+        persist_queue = queue.Queue(maxsize=self.max_workers * 2)
+        self._queues = {"pages": page_queue, "persist": persist_queue}
+
+        listing_stage = threading.Thread(
+            target=self._run_listing_stage, args=(page_queue, stop, errors), daemon=True
+        )
+        persistence_stage = threading.Thread(
+            target=self._run_persistence_stage, args=(persist_queue, summary_writer, errors), daemon=True
+        )
+        listing_stage.start()
+        persistence_stage.start()
+
+        try:
+            if self.executor is not None:
+                self._consume_products(self.executor, page_queue, persist_queue, errors)
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    self._consume_products(executor, page_queue, persist_queue, errors)
+        finally:
+            # Stop the listing stage and let the persistence stage drain
+            stop.set()
+            persist_queue.put(None)
+            persistence_stage.join()
+
+        if errors:
+            raise errors[0]
+
+    def _run_listing_stage(self, page_queue, stop, errors):
+        """
+        Listing stage: fetch search result pages in order and queue their product items.
+
+        Pages run from config.start_page up to config.last_page, if set. Pages without
+        products are skipped; after MAX_EMPTY_PAGES of them in a row the results are
+        considered exhausted. A None sentinel marks the end of the frontier.
+
+        Args:
+            page_queue (queue.Queue): Receives (page_number, items) tuples.
+            stop (threading.Event): Set when the crawl no longer needs pages.
+            errors (list): Collects an unexpected exception for the ordering stage to raise.
+        """
+        page_number = int(self.config.start_page)
+        last_page = self.config.last_page
+        empty_pages = 0            # Consecutive pages without products
+        try:
+            while not stop.is_set() and empty_pages < MAX_EMPTY_PAGES:
+                if last_page is not None and page_number > last_page:
                     break
 
-                product_soup = self.fetch_page_soup(link)
-                if not product_soup:
+                # Pages finished by an interrupted run are not fetched again
+                if page_number in self._crawl_state.pages_done:
+                    page_number += 1
+                    empty_pages = 0
                     continue
 
-                product_data = self.extract_product_details(product_soup)
-                if not product_data.get("product_name"):
-                    continue  # Skip incomplete entries
+                # Construct the URL for the current page
+                url = f"{self.base_url}&page={page_number}"
+                soup = self.fetch_page_soup(url, page_type="search")
+
+                # Extract links (and listing records) for individual products
+                page_items = self.extract_page_items(soup) if soup else []
+                if not page_items:
+                    empty_pages += 1
+                elif _put_until_stopped(page_queue, (page_number, page_items), stop):
+                    empty_pages = 0
+                else:
+                    return
+
+                # Move to the next search results page
+                page_number += 1
+        except Exception as error:
+            errors.append(error)
+        _put_until_stopped(page_queue, None, stop)
+
+    def _consume_products(self, executor, page_queue, persist_queue, errors):
+        """
+        Ordering stage: schedule detail fetches and hand finished products on in link order.
+
+        Once every product of a search page has been handled, a page event is
+        queued behind them so the journal only marks the page done after its
+        products are on disk.
+
+        Args:
+            executor (ThreadPoolExecutor): Worker pool running scrape_product.
+            page_queue (queue.Queue): Pages produced by the listing stage.
+            persist_queue (queue.Queue): Receives ("product", index, product_data)
+                and ("page", page_number) events for the persistence stage.
+            errors (list): Exceptions of the other stages; scheduling stops at the first.
+        """
+        pending = deque()          # (page_number, claim, future) in flight, oldest first
+        self._queues["products"] = pending
+        pages = PageProgress(pending, persist_queue)
+        page_items = iter(())
+
+        try:
+            # A failed stage ends the crawl; nothing more is fetched for it
+            while self._accepted_products < self.target and not errors:
+                # Never keep more fetches in flight than products still needed,
+                # so reaching the target does not leave wasted requests behind
+                while len(pending) < min(self.concurrency_limit, self.target - self._accepted_products):
+                    item = next(page_items, None)
+                    if item is None:
+                        if pages.exhausted:
+                            break
+                        # Only wait for the next page when nothing else is in flight
+                        try:
+                            page = page_queue.get(block=not pending)
+                        except queue.Empty:
+                            break
+                        if page is None:
+                            pages.end_of_pages()
+                            break
+                        page_number, items = page
+                        pages.start_page(page_number)
+                        page_items = iter(items)
+                        continue
+                    # Skip duplicates before spending a request on them
+                    claim = self.claim_product(item[0])
+                    if not claim:
+                        continue
+                    pending.append((pages.current_page, claim, executor.submit(self.scrape_product, *item)))
+
+                if not pending:
+                    break  # Every page has been processed
+
+                # Stays in pending until it has a result, so an interrupt releases its claim too
+                result = pending[0][2].result()
+                _, claim, _ = pending.popleft()
+                self._accept_result(claim, result, persist_queue)
+                pages.finish_pages()
+        finally:
+            # Target reached, failure or interrupt: drop anything still queued
+            self._cancel_pending(pending)
 
-                collected_products += 1
-                self.save_product_data(product_data, collected_products)
-                all_products.append(product_data)
+    def _cancel_pending(self, pending):
+        """
+        Cancel the fetches still in flight and hand their claims back to other
+        crawls sharing the seen index.
+
+        Args:
+            pending (deque): (page_number, claim, future or task) entries.
+        """
+        for _, claim, future in pending:
+            future.cancel()
+            if claim is not True:
+                self.seen_index.release(claim)
+
+    def _accept_result(self, claim, product_data, persist_queue):
+        """
+        Number a scraped product and queue it for persistence, or give its claim back.
+
+        Args:
+            claim (str | bool): Claim returned by claim_product for the link.
+            product_data (dict | None): Result of scraping the link.
+            persist_queue (queue.Queue): Receives ("product", index, product_data).
+        """
+        if product_data:
+            self._accepted_products += 1
+            persist_queue.put(("product", self._crawl_state.next_index, product_data))
+            self._crawl_state.next_index += 1
+            return
 
-                # Update summary file
+        # Let a later listing of the same product try again
+        self._claimed_asins.discard(claim)
+        if claim is not True:
+            self.seen_index.release(claim)
+
+    def _run_persistence_stage(self, persist_queue, summary_writer, errors):
+        """
+        Persistence stage: save products, journal progress and report it, in the order received.
+
+        Runs until it receives a None sentinel. Entries already waiting are taken
+        together, up to the storage's batch size, and written in one flush; only
+        then are they added to the seen index, summary and journal, so the journal
+        never records a product the storage could still lose. After a failure it
+        keeps draining the queue so the ordering stage never blocks on it.
+
+        Args:
+            persist_queue (queue.Queue): Product and page events from the ordering stage.
+            summary_writer (JsonSummaryWriter | JsonlSummaryWriter): Receives each saved product.
+            errors (list): Collects the first exception for the ordering stage to raise.
+        """
+        finished = False
+        while not finished:
+            entries = [persist_queue.get()]
+            while entries[-1] is not None and len(entries) < self.storage.batch_size:
                 try:
-                    with open(SUMMARY_FILE, "w", encoding="utf-8") as summary_file:
-                        json.dump(all_products, summary_file, indent=4)
-                except Exception:
-                    # If file write fails, silently continue
-                    pass
-
-                # Prepare a short message for the UI
-                short_title = (
-                    product_data["product_name"][:50] + "..."
-                    if len(product_data["product_name"]) > 50
-                    else product_data["product_name"]
-                )
+                    entries.append(persist_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if entries[-1] is None:
+                entries.pop()
+                finished = True
+            if errors or not entries:
+                continue
+
+            try:
+                for entry in entries:
+                    if entry[0] == "product":
+                        with self.metrics.timer("save"):
+                            self.save_product_data(entry[2], entry[1])
+                with self.metrics.timer("flush"):
+                    self.storage.flush()
+
+                for entry in entries:
+                    if entry[0] == "page":
+                        self.journal.page_done(entry[1])
+                        continue
+
+                    _, index, product_data = entry
+                    if product_data.get("asin"):
+                        self.seen_index.add(product_data["asin"])
 
-                # Send progress update to UI
-                self.update_progress_callback(collected_products, f"Just scraped: {short_title}")
+                    # Update summary file
+                    with self.metrics.timer("summary"):
+                        summary_writer.add(product_data)
+                    self.journal.product_saved(index, product_data.get("asin"))
+                    self.collected_products += 1
+                    self.metrics.increment("products_saved")
 
-                # Wait randomly to mimic human behavior
-                time.sleep(random.uniform(5.0, 12.0))
+                    # Prepare a short message for the UI
+                    short_title = (
+                        product_data["product_name"][:50] + "..."
+                        if len(product_data["product_name"]) > 50
+                        else product_data["product_name"]
+                    )
 
-            # Move to the next search results page
-            page_number += 1
+                    # Send progress update to UI; index only names the output
+                    self.update_progress_callback(self.collected_products, f"Just scraped: {short_title}")
+            except Exception as error:
+                errors.append(error)
+
+
+# Extractor of an extraction worker process, set up by _init_extraction_worker
+_worker_scraper = None
+
+
+def _init_extraction_worker(parser, partial_parse):
+    """
+    Prepare an extraction worker process; runs once per process.
+
+    Args:
+        parser (str): BeautifulSoup parser backend chosen by the parent scraper.
+        partial_parse (bool): Whether to parse with PRODUCT_PAGE_FILTER first.
+    """
+    global _worker_scraper
+    _worker_scraper = Scraper(
+        lambda count, message: None,
+        session=requests.Session(),
+        parser=parser,
+        partial_parse=partial_parse,
+        seen_index=SeenIndex(),
+    )
+
+
+def _extract_in_worker(html_bytes):
+    """
+    Extract product details in a worker process.
+
+    Args:
+        html_bytes (bytes): UTF-8 markup of a product detail page.
+
+    Returns:
+        dict: Product information.
+    """
+    return _worker_scraper.extract_product_html(html_bytes.decode("utf-8"))
+
+
+def _put_until_stopped(target_queue, item, stop):
+    """
+    Put an item on a bounded queue, giving up once the stop event is set.
+
+    Args:
+        target_queue (queue.Queue): Queue to put the item on.
+        item (object): Item to enqueue.
+        stop (threading.Event): Abandons the put when set.
+
+    Returns:
+        bool: True if the item was enqueued.
+    """
+    while not stop.is_set():
+        try:
+            target_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
@@ -0,0 +1,265 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# File name of a product saved by JsonFileStorage
+PRODUCT_FILE_PATTERN = re.compile(r"^product_(\d+)\.json$")
+
+# Columns stored next to the full record, so common filters and sorts use an index
+PRODUCT_COLUMNS = (
+    "product_name", "price", "shipping_price", "seller_name", "brand",
+    "price_cents", "currency", "shipping_cents",
+)
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    asin TEXT PRIMARY KEY,
+    output_index INTEGER,
+    product_name TEXT,
+    price TEXT,
+    shipping_price TEXT,
+    seller_name TEXT,
+    brand TEXT,
+    price_cents INTEGER,
+    currency TEXT,
+    shipping_cents INTEGER,
+    record TEXT NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_brand ON products (brand);
+CREATE INDEX IF NOT EXISTS products_seller_name ON products (seller_name);
+CREATE INDEX IF NOT EXISTS products_price_cents ON products (price_cents);
+"""
+
+
+class ProductStorage:
+    """
+    Interface of the places scraped products are saved to.
+
+    save() may buffer; everything saved is durable once flush() returns.
+    The scraper calls flush() after each group of products and only then
+    records them in the seen index and crawl journal, so a crash never
+    leaves the journal claiming a product the storage lost.
+    """
+
+    # Number of products the scraper may hand over before calling flush()
+    batch_size = 1
+
+    def save(self, product_data, index):
+        """
+        Save one product.
+
+        Args:
+            product_data (dict): Extracted product information.
+            index (int): Output index of the product within its run.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """
+        Make every saved product durable.
+        """
+
+    def next_index(self):
+        """
+        Return the output index following the products already stored.
+
+        Returns:
+            int: 1 for an empty storage.
+        """
+        return 1
+
+    def close(self):
+        """
+        Flush and release the storage.
+        """
+        self.flush()
+
+
+class JsonFileStorage(ProductStorage):
+    """
+    Saves each product as a pretty-printed product_<index>.json file in a folder.
+    """
+
+    def __init__(self, folder):
+        """
+        Initialize the storage.
+
+        Args:
+            folder (str): Folder receiving the product files; created when needed.
+        """
+        self.folder = folder
+
+    def save(self, product_data, index):
+        """
+        Save product details to a local JSON file.
+
+        Args:
+            product_data (dict): Extracted product information.
+            index (int): Product index used for filename.
+        """
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+        filename = os.path.join(self.folder, f"product_{index}.json")
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(product_data, f, ensure_ascii=False, indent=2)
+
+    def next_index(self):
+        """
+        Return the index after the highest product_<n>.json in the folder.
+
+        Returns:
+            int: 1 if the folder holds no product files.
+        """
+        if not os.path.isdir(self.folder):
+            return 1
+        indexes = [
+            int(match.group(1))
+            for match in map(PRODUCT_FILE_PATTERN.match, os.listdir(self.folder))
+            if match
+        ]
+        return max(indexes, default=0) + 1
+
+
+class SQLiteStorage(ProductStorage):
+    """
+    Saves products into one SQLite database keyed by ASIN.
+
+    The database runs in WAL mode, so readers can query it while a crawl
+    writes, and products are inserted in batched transactions instead of one
+    commit per product. Brand, seller and price (as integer cents) are indexed. Saving a product
+    again replaces its row, so reruns and batches never duplicate an ASIN;
+    products without an ASIN are keyed by their output index instead.
+    """
+
+    def __init__(self, path, batch_size=100):
+        """
+        Open (or create) the database.
+
+        Args:
+            path (str): Location of the database file.
+            batch_size (int): Most products written in one transaction.
+        """
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self._pending = []
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        # Written from the scraper's persistence thread, created on the caller's
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")    # Safe against crashes; only power loss can undo a commit
+        self._connection.executescript(SQLITE_SCHEMA)
+
+    def save(self, product_data, index):
+        """
+        Queue a product for the current transaction, writing it once the batch is full.
+
+        Args:
+            product_data (dict): Extracted product information.
+            index (int): Output index of the product within its run.
+        """
+        key = product_data.get("asin") or f"index:{index}"
+        row = (key, index, *(product_data.get(column) for column in PRODUCT_COLUMNS),
+               json.dumps(product_data, ensure_ascii=False), time.time())
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        Write queued products in a single transaction.
+        """
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if not rows:
+                return
+            placeholders = ", ".join("?" * (len(PRODUCT_COLUMNS) + 4))
+            with self._connection:
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO products (asin, output_index, {', '.join(PRODUCT_COLUMNS)}, "
+                    f"record, scraped_at) VALUES ({placeholders})",
+                    rows,
+                )
+
+    def close(self):
+        """
+        Write queued products and close the database.
+        """
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    def next_index(self):
+        """
+        Return the index after the highest output_index in the database.
+
+        Returns:
+            int: 1 for an empty database.
+        """
+        self.flush()
+        with self._lock:
+            highest = self._connection.execute("SELECT MAX(output_index) FROM products").fetchone()[0]
+        return (highest or 0) + 1
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def find(self, brand=None, seller_name=None, max_price_cents=None, order_by="output_index"):
+        """
+        Return stored products, optionally filtered by brand, seller and price.
+
+        Args:
+            brand (str | None): Only products of this brand.
+            seller_name (str | None): Only products sold by this seller.
+            max_price_cents (int | None): Only products with a known price up to this amount.
+            order_by (str): Column to sort by, e.g. "price_cents" or "output_index".
+
+        Returns:
+            list[dict]: Matching product records.
+        """
+        if order_by not in ("asin", "output_index", "scraped_at") + PRODUCT_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by!r}")
+        conditions, params = [], []
+        for column, value in (("brand", brand), ("seller_name", seller_name)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if max_price_cents is not None:
+            conditions.append("price_cents <= ?")
+            params.append(max_price_cents)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT record FROM products{where} ORDER BY {order_by}", params
+            ).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+
+def create_storage(config):
+    """
+    Create the product storage selected by a run config.
+
+    Args:
+        config (RunConfig): Run settings; storage is "json" or "sqlite".
+
+    Returns:
+        ProductStorage: JsonFileStorage writing to config.output_folder, or
+        SQLiteStorage writing to config.database_file.
+    """
+    if config.storage == "sqlite":
+        return SQLiteStorage(config.database_file)
+    return JsonFileStorage(config.output_folder)
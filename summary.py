@@ -0,0 +1,200 @@
+import json
+import os
+
+# Bytes read at a time when looking back for the end of the last complete line
+TAIL_CHUNK = 4096
+
+
+class JsonSummaryWriter:
+    """
+    Summary writer that keeps the whole summary as one pretty-printed JSON array.
+
+    The array is rewritten after every record, which keeps the file valid at all
+    times but costs O(n^2) bytes per run. Suitable for small targets only.
+    """
+
+    def __init__(self, path, records=None):
+        """
+        Initialize the writer.
+
+        Args:
+            path (str): Location of the JSON array summary file.
+            records (list[dict] | None): Records already in the summary, e.g. when resuming.
+        """
+        self.path = path
+        self.records = list(records or [])
+
+    def add(self, record):
+        """
+        Append a record and rewrite the summary file.
+
+        Args:
+            record (dict): Product information to add to the summary.
+        """
+        self.records.append(record)
+        try:
+            with open(self.path, "w", encoding="utf-8") as summary_file:
+                json.dump(self.records, summary_file, indent=4)
+        except Exception:
+            # If file write fails, silently continue
+            pass
+
+    def finalize(self):
+        """
+        Nothing to do: the file is already complete after every add().
+        """
+
+
+class JsonlSummaryWriter:
+    """
+    Append-only summary writer producing one JSON record per line (JSON Lines).
+
+    Each record costs a single append, so total bytes written grow linearly with
+    the number of products. The file is flushed after every record and fsynced
+    every fsync_every records, so a crash loses at most that many lines.
+    finalize() can still produce the pretty JSON array for consumers that need it.
+    """
+
+    def __init__(self, path, array_path=None, fsync_every=25, append=False):
+        """
+        Initialize the writer and open the JSONL file.
+
+        Args:
+            path (str): Location of the JSON Lines summary file.
+            array_path (str | None): Where finalize() writes the pretty JSON array.
+                None skips the array conversion.
+            fsync_every (int): Number of records between fsync calls.
+            append (bool): Keep existing lines instead of starting a fresh file.
+        """
+        self.path = path
+        self.array_path = array_path
+        self.fsync_every = max(1, int(fsync_every))
+        self._unsynced = 0
+        self._file = open_for_append(path) if append else open(path, "w", encoding="utf-8")
+
+    def add(self, record):
+        """
+        Append a record as a single line.
+
+        Args:
+            record (dict): Product information to add to the summary.
+        """
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self._sync()
+
+    def _sync(self):
+        """
+        Force buffered lines to disk.
+        """
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def finalize(self):
+        """
+        Sync and close the JSONL file, then write the pretty JSON array if requested.
+
+        The array is streamed record by record into a temporary file and moved
+        into place atomically, so readers never see a half-written summary.
+        """
+        if not self._file.closed:
+            self._sync()
+            self._file.close()
+        if self.array_path:
+            write_json_array(self.path, self.array_path)
+
+
+def open_for_append(path):
+    """
+    Open a line-oriented file for appending, dropping a truncated final line first.
+
+    A crash mid-write can leave the last line without its newline; appending
+    straight after it would glue the next line onto it and lose both.
+
+    Args:
+        path (str): Location of the file; created when missing.
+
+    Returns:
+        file: Text file opened in append mode.
+    """
+    if os.path.exists(path):
+        with open(path, "r+b") as existing:
+            end = existing.seek(0, os.SEEK_END)
+            if end:
+                existing.seek(end - 1)
+                if existing.read(1) != b"\n":
+                    # Keep everything up to the last newline
+                    position = end
+                    keep = 0
+                    while position > 0:
+                        start = max(0, position - TAIL_CHUNK)
+                        existing.seek(start)
+                        newline = existing.read(position - start).rfind(b"\n")
+                        if newline != -1:
+                            keep = start + newline + 1
+                            break
+                        position = start
+                    existing.truncate(keep)
+    return open(path, "a", encoding="utf-8")
+
+
+def read_json_array(path):
+    """
+    Read the records of a JSON array summary file.
+
+    Args:
+        path (str): Location of the JSON array file.
+
+    Returns:
+        list[dict]: Stored records, or an empty list if the file is missing or invalid.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as summary_file:
+            records = json.load(summary_file)
+    except (OSError, ValueError):
+        return []
+    return records if isinstance(records, list) else []
+
+
+def read_jsonl(path):
+    """
+    Iterate over the records stored in a JSON Lines file.
+
+    Blank lines and a truncated final line (left by a crash mid-write) are skipped.
+
+    Args:
+        path (str): Location of the JSON Lines file.
+
+    Yields:
+        dict: One record per line.
+    """
+    with open(path, "r", encoding="utf-8") as jsonl_file:
+        for line in jsonl_file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def write_json_array(jsonl_path, array_path):
+    """
+    Convert a JSON Lines summary into a pretty-printed JSON array file.
+
+    Args:
+        jsonl_path (str): Source JSON Lines file.
+        array_path (str): Destination JSON array file.
+    """
+    temp_path = array_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as array_file:
+        array_file.write("[")
+        for position, record in enumerate(read_jsonl(jsonl_path)):
+            array_file.write(",\n" if position else "\n")
+            encoded = json.dumps(record, indent=4)
+            array_file.write("    " + encoded.replace("\n", "\n    "))
+        array_file.write("\n]")
+    os.replace(temp_path, array_path)